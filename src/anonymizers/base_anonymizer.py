@@ -5,7 +5,7 @@ This module defines the abstract base class that all anonymizers must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from src.models import PIIMatch
 
 
@@ -60,31 +60,53 @@ class BaseAnonymizer(ABC):
         Anonymize multiple PII matches in text.
         
         This method efficiently replaces all detected PII in the text with
-        anonymized versions. It processes matches in reverse order to maintain
-        correct string positions.
-        
+        anonymized versions. It walks the text once left to right, collecting
+        untouched slices and replacements, and joins them in a single pass -
+        O(len(text)) total copying, where rebuilding the string per match
+        would be O(matches * len(text)).
+
         Args:
             matches: List of PIIMatch objects to anonymize
             text: The original text containing the PII
-            
+
         Returns:
             Text with all PII anonymized
         """
         if not matches:
             return text
-        
-        # Sort matches by position in reverse order to maintain string indices
-        sorted_matches = sorted(matches, key=lambda m: m.start, reverse=True)
-        
-        result = text
+        return ''.join(self.iter_anonymized_parts(matches, text))
+
+    def iter_anonymized_parts(self, matches: List[PIIMatch], text: str) -> Iterator[str]:
+        """
+        Yield the pieces of the anonymized text without joining them.
+
+        Yields untouched slices of the original text interleaved with
+        replacement strings, in document order. Callers that only need to
+        write the result (e.g. straight to a file) can consume the parts
+        directly and skip materializing the full joined string.
+
+        Args:
+            matches: List of PIIMatch objects to anonymize
+            text: The original text containing the PII
+
+        Yields:
+            Alternating text slices and replacement strings
+        """
+        # Sort matches by position for the left-to-right sweep
+        sorted_matches = sorted(matches, key=lambda m: m.start)
+
+        cursor = 0
         for match in sorted_matches:
-            # Get the anonymized replacement
-            replacement = self.anonymize(match, text)
-            
-            # Replace the PII in the text
-            result = result[:match.start] + replacement + result[match.end:]
-        
-        return result
+            # Matches are merged upstream; skip any stray overlap rather
+            # than double-replacing the same span
+            if match.start < cursor:
+                continue
+
+            yield text[cursor:match.start]
+            yield self.anonymize(match, text)
+            cursor = match.end
+
+        yield text[cursor:]
     
     def get_config_option(self, key: str, default: Any = None) -> Any:
         """
@@ -119,7 +119,7 @@ Examples:
         '--workers',
         type=int,
         default=None,
-        help='Number of parallel workers for CSV processing (default: auto-detect CPU cores)'
+        help='Number of parallel workers for CSV or directory processing (default: auto-detect CPU cores for CSV, 1 for directories)'
     )
 
     parser.add_argument(
@@ -456,12 +456,24 @@ def main():
             )
         elif args.dir:
             # Directory mode
+            if args.single_threaded:
+                workers = 1
+            elif args.workers is not None:
+                workers = args.workers
+            else:
+                # Fall back to the config knob so server deployments can
+                # set parallelism without passing --workers every run
+                workers = config_manager.config_data.get(
+                    'processing', {}
+                ).get('parallel_workers', 1)
+
             print("Initializing processor...")
             processor = FileProcessor(config_manager.config_data)
             results = processor.process_directory(
                 input_dir=args.input,
                 output_dir=args.output,
-                recursive=args.recursive
+                recursive=args.recursive,
+                workers=workers
             )
         else:
             # Single file mode
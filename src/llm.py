@@ -15,7 +15,9 @@ import json
 import logging
 import os
 import re
+import sys
 import time
+from functools import lru_cache
 from typing import Any, Optional
 
 from src.models import PIIMatch
@@ -23,8 +25,52 @@ from src.processors.pii_detection import FALSE_POSITIVE_WORDS
 
 logger = logging.getLogger(__name__)
 
-
-# Default system prompt for PII detection
+# Response-parsing patterns, compiled once: the first grabs the
+# outermost JSON array, the second matches texts that are only
+# whitespace and redaction tokens, which are skipped without an API call
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_REDACTED_ONLY_RE = re.compile(r'[\s\[\]A-Z_]*')
+
+
+def _strip_markdown_fence(content: str) -> str:
+    """Strip a ```lang fence around a response with plain string ops."""
+    body = content.partition('\n')[2] or content
+    if body.endswith('```'):
+        body = body[:-3].rstrip()
+    return body
+
+# Azure credential/token cache. DefaultAzureCredential construction
+# probes IMDS, environment, and the CLI (hundreds of ms to seconds), so
+# one credential is shared by every client built in this process; the
+# async client's bearer token is reused until five minutes before expiry.
+_AZURE_SCOPE = "https://cognitiveservices.azure.com/.default"
+_azure_credential = None
+_azure_token = None
+
+
+def _get_azure_credential():
+    """Return the process-wide DefaultAzureCredential, building it once."""
+    global _azure_credential
+    if _azure_credential is None:
+        from azure.identity import DefaultAzureCredential
+        _azure_credential = DefaultAzureCredential()
+    return _azure_credential
+
+
+def _get_azure_token() -> str:
+    """Return a cached Azure bearer token, refreshing near expiry."""
+    global _azure_token
+    if _azure_token is None or _azure_token.expires_on - time.time() < 300:
+        _azure_token = _get_azure_credential().get_token(_AZURE_SCOPE)
+    return _azure_token.token
+
+
+# Default system prompt for PII detection.
+#
+# Keep this byte-stable: providers cache the longest identical prompt
+# prefix across requests, and the static system message coming first is
+# what lets every per-text call after the first hit that cache. Any
+# edit here (even whitespace) invalidates the prefix for a deployment.
 DEFAULT_SYSTEM_PROMPT = """Find PII in text. Return JSON array only.
 
 DETECT: names, addresses, partial addresses, phones, emails, australian gov IDs, NBN codes (AVC/LOC)
@@ -81,11 +127,10 @@ def create_llm_client(config: dict[str, Any]) -> Optional[Any]:
     # Auto-detect Azure and try managed identity first
     if base_url and 'azure' in base_url.lower():
         try:
-            from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-            credential = DefaultAzureCredential()
+            from azure.identity import get_bearer_token_provider
             token_provider = get_bearer_token_provider(
-                credential,
-                "https://cognitiveservices.azure.com/.default"
+                _get_azure_credential(),
+                _AZURE_SCOPE
             )
             logger.debug("Using Azure managed identity for LLM authentication")
             return OpenAI(
@@ -132,6 +177,12 @@ def detect_pii_with_llm(
         List of PIIMatch objects with detected PII
     """
     CONFIDENCE = 0.85  # LLM detections - consistent confidence score
+
+    # Skip texts that cannot contain PII without spending an API call:
+    # empty/whitespace, shorter than any PII value, or nothing but
+    # whitespace and redaction tokens (same guard as the batch paths)
+    if len(text) < 3 or not text.strip() or _REDACTED_ONLY_RE.fullmatch(text):
+        return []
     
     # Call LLM
     response = client.chat.completions.create(
@@ -143,17 +194,17 @@ def detect_pii_with_llm(
     )
     
     content = response.choices[0].message.content.strip()
-    
+
+    _log_cached_tokens(response)
+
     # Parse JSON from response
     try:
         # Handle markdown code blocks
         if content.startswith("```"):
-            match = re.search(r'\[.*?\]', content, re.DOTALL)
-            if match:
-                content = match.group(0)
+            content = _strip_markdown_fence(content)
         
         # Find JSON array
-        match = re.search(r'\[.*\]', content, re.DOTALL)
+        match = _JSON_ARRAY_RE.search(content)
         results = json.loads(match.group(0)) if match else []
     except (json.JSONDecodeError, AttributeError):
         logger.debug(f"Failed to parse LLM response as JSON: {content[:100]}")
@@ -162,8 +213,9 @@ def detect_pii_with_llm(
     # Entity types that should be filtered for false positives
     FILTERABLE_TYPES = {'PERSON', 'ORGANIZATION', 'LOCATION', 'ORG', 'NRP', 'GPE'}
     
-    # Convert to PIIMatch objects
+    # Convert to PIIMatch objects; lower the text once for all values
     matches = []
+    text_lower = text.lower() if results else ''
     for result in results:
         value = result.get("v") or result.get("value")
         pii_type = result.get("t") or result.get("type")
@@ -171,26 +223,26 @@ def detect_pii_with_llm(
         if not value or not pii_type:
             continue
         
-        # Normalize type for comparison
-        normalized_type = pii_type.upper().replace(" ", "_").replace("-", "_")
+        # Normalize type for comparison; interned so the thousands of
+        # matches sharing a type share one string object
+        normalized_type = sys.intern(pii_type.upper().replace(" ", "_").replace("-", "_"))
         
         # Filter false positives for name/org/location types
         if normalized_type in FILTERABLE_TYPES:
-            value_lower = value.lower()
-            words = value_lower.split()
-            # Skip if any word is a known false positive
-            if any(word in FALSE_POSITIVE_WORDS for word in words):
+            # Skip if any word is a known false positive (isdisjoint runs
+            # the membership loop in C)
+            if not FALSE_POSITIVE_WORDS.isdisjoint(value.casefold().split()):
                 logger.debug(f"LLM false positive filtered: '{value}' ({pii_type})")
                 continue
         
         # Find position in text (returns actual span for flexible matches)
-        start, end = _find_position(value, text)
+        start, end = _find_position(value, text, text_lower)
         if start == -1:
             logger.debug(f"LLM detected '{value}' but couldn't find position in text")
             continue
         
         matches.append(PIIMatch(
-            pii_type=pii_type.upper().replace(" ", "_").replace("-", "_"),
+            pii_type=normalized_type,
             value=text[start:end],
             start=start,
             end=end,
@@ -202,35 +254,67 @@ def detect_pii_with_llm(
     return matches
 
 
-def _find_position(value: str, text: str) -> tuple[int, int]:
+def _log_cached_tokens(response: Any) -> None:
+    """
+    Log how many prompt tokens were served from the provider's prefix cache.
+
+    Lets operators verify the static system prompt is actually cache-hitting
+    (cached_tokens should be near the system prompt size on every call after
+    the first).
+
+    Args:
+        response: Chat completion response object
+    """
+    usage = getattr(response, 'usage', None)
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached = getattr(details, 'cached_tokens', None)
+    if cached is not None:
+        logger.debug(f"LLM prompt tokens served from cache: {cached}")
+
+
+@lru_cache(maxsize=1024)
+def _flexible_pattern(value: str) -> 're.Pattern[str]':
+    """Compiled whitespace-flexible pattern for a value, cached per value."""
+    return re.compile(
+        r'\s*'.join(re.escape(c) for c in value if not c.isspace()),
+        re.IGNORECASE,
+    )
+
+
+def _find_position(
+    value: str, text: str, text_lower: Optional[str] = None
+) -> tuple[int, int]:
     """
     Find position of value in text with flexible matching.
-    
+
     Tries exact match first, then case-insensitive, then flexible whitespace.
-    
+
     Args:
         value: The value to find
         text: The text to search in
-        
+        text_lower: Optional pre-lowered text, so callers resolving many
+            values against one text lower it once instead of per value
+
     Returns:
         Tuple of (start, end) positions or (-1, -1) if not found
     """
-    # Exact match
+    # Exact match (str.find runs CPython's C two-way search)
     start = text.find(value)
     if start != -1:
         return start, start + len(value)
-    
+
     # Case-insensitive
-    start = text.lower().find(value.lower())
+    if text_lower is None:
+        text_lower = text.lower()
+    start = text_lower.find(value.lower())
     if start != -1:
         return start, start + len(value)
-    
+
     # Flexible whitespace (e.g., "0412345678" matches "0412 345 678")
-    pattern = r'\s*'.join(re.escape(c) for c in value if not c.isspace())
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = _flexible_pattern(value).search(text)
     if match:
         return match.start(), match.end()  # Actual span, not assumed length
-    
+
     return -1, -1
 
 
@@ -260,7 +344,7 @@ def detect_pii_batch(
     
     for i, text in enumerate(texts):
         # Skip empty or fully-redacted texts (don't waste API calls)
-        if not text.strip() or re.fullmatch(r'[\s\[\]A-Z_]*', text):
+        if not text.strip() or _REDACTED_ONLY_RE.fullmatch(text):
             results.append([])
             continue
         
@@ -300,6 +384,7 @@ def create_async_llm_client(config: dict[str, Any]) -> Optional[Any]:
     settings = config.get('settings', {})
     max_retries = settings.get('max_retries', 3)
     timeout = settings.get('timeout', 30.0)
+    max_concurrent = settings.get('max_concurrent', 50)
 
     base_url = _resolve_env(config.get('base_url', '')) or None
     api_key = _resolve_env(config.get('api_key', ''))
@@ -307,11 +392,8 @@ def create_async_llm_client(config: dict[str, Any]) -> Optional[Any]:
     # Auto-detect Azure and get token (async client needs actual token, not provider)
     if base_url and 'azure' in base_url.lower():
         try:
-            from azure.identity import DefaultAzureCredential
-            credential = DefaultAzureCredential()
             # Get actual token for async client (token provider doesn't work with async)
-            token = credential.get_token("https://cognitiveservices.azure.com/.default")
-            api_key = token.token
+            api_key = _get_azure_token()
             logger.debug("Using Azure managed identity token for async LLM client")
         except Exception as e:
             if not api_key:
@@ -323,11 +405,26 @@ def create_async_llm_client(config: dict[str, Any]) -> Optional[Any]:
         logger.warning("No api_key or base_url configured for LLM")
         return None
 
+    # Size the connection pool to the batch concurrency and keep
+    # connections warm between requests: httpx's default of 20 keepalive
+    # connections would tear down and re-handshake most of the pool on
+    # every wave when max_concurrent exceeds it
+    import httpx
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_concurrent,
+            max_keepalive_connections=max_concurrent,
+            keepalive_expiry=60.0,
+        ),
+        timeout=timeout,
+    )
+
     return AsyncOpenAI(
         base_url=base_url,
         api_key=api_key or "not-needed",
         max_retries=max_retries,
         timeout=timeout,
+        http_client=http_client,
     )
 
 
@@ -358,7 +455,7 @@ async def _detect_pii_async(
     CONFIDENCE = 0.85
 
     # Skip empty or fully-redacted texts
-    if not text.strip() or re.fullmatch(r'[\s\[\]A-Z_]*', text):
+    if not text.strip() or _REDACTED_ONLY_RE.fullmatch(text):
         return index, []
 
     async with semaphore:
@@ -377,20 +474,21 @@ async def _detect_pii_async(
 
             content = response.choices[0].message.content.strip()
 
+            _log_cached_tokens(response)
+
             # Parse JSON from response
             try:
                 if content.startswith("```"):
-                    match = re.search(r'\[.*?\]', content, re.DOTALL)
-                    if match:
-                        content = match.group(0)
+                    content = _strip_markdown_fence(content)
 
-                match = re.search(r'\[.*\]', content, re.DOTALL)
+                match = _JSON_ARRAY_RE.search(content)
                 results = json.loads(match.group(0)) if match else []
             except (json.JSONDecodeError, AttributeError):
                 results = []
 
-            # Convert to PIIMatch objects
+            # Convert to PIIMatch objects; lower the text once for all values
             matches = []
+            text_lower = text.lower() if results else ''
             for result in results:
                 value = result.get("v") or result.get("value")
                 pii_type = result.get("t") or result.get("type")
@@ -398,12 +496,14 @@ async def _detect_pii_async(
                 if not value or not pii_type:
                     continue
 
-                start, end = _find_position(value, text)
+                start, end = _find_position(value, text, text_lower)
                 if start == -1:
                     continue
 
                 matches.append(PIIMatch(
-                    pii_type=pii_type.upper().replace(" ", "_").replace("-", "_"),
+                    pii_type=sys.intern(
+                        pii_type.upper().replace(" ", "_").replace("-", "_")
+                    ),
                     value=text[start:end],
                     start=start,
                     end=end,
@@ -492,6 +592,23 @@ async def _detect_pii_batch_async(
     return [results_dict[i] for i in range(len(texts))]
 
 
+async def _run_batch_and_close(
+    client: Any,
+    texts: list[str],
+    model: str,
+    system_prompt: str,
+    max_concurrent: int,
+    show_progress: bool,
+) -> list[list[PIIMatch]]:
+    """Run the async batch, then close the client's connection pool."""
+    try:
+        return await _detect_pii_batch_async(
+            client, texts, model, system_prompt, max_concurrent, show_progress
+        )
+    finally:
+        await client.close()
+
+
 def detect_pii_batch_concurrent(
     config: dict[str, Any],
     texts: list[str],
@@ -512,8 +629,6 @@ def detect_pii_batch_concurrent(
     Returns:
         List of PIIMatch lists, one per input text
     """
-    import asyncio
-
     # Suppress verbose Azure/HTTP logging during LLM client creation
     noisy_loggers = ['azure', 'azure.identity', 'azure.core', 'httpx', 'httpcore']
     saved_levels = {}
@@ -539,7 +654,7 @@ def detect_pii_batch_concurrent(
     non_empty_indices = []
     non_empty_texts = []
     for i, text in enumerate(texts):
-        if text.strip() and not re.fullmatch(r'[\s\[\]A-Z_]*', text):
+        if text.strip() and not _REDACTED_ONLY_RE.fullmatch(text):
             non_empty_indices.append(i)
             non_empty_texts.append(text)
 
@@ -549,15 +664,11 @@ def detect_pii_batch_concurrent(
     if not non_empty_texts:
         return [[] for _ in texts]
 
-    # Run async batch
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    async_results = loop.run_until_complete(
-        _detect_pii_batch_async(client, non_empty_texts, model, system_prompt, max_concurrent, show_progress)
+    # Run async batch: asyncio.run creates a fresh loop and tears it down
+    # (this sync entry point is never called with a loop already running),
+    # and the wrapper closes the client's HTTP pool when the batch is done
+    async_results = asyncio.run(
+        _run_batch_and_close(client, non_empty_texts, model, system_prompt, max_concurrent, show_progress)
     )
 
     # Map results back to original indices
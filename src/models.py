@@ -32,7 +32,7 @@ class AnonymizationStrategy(Enum):
     HASH = "hash"
 
 
-@dataclass
+@dataclass(slots=True)
 class PIIMatch:
     """
     Represents a detected PII instance in text.
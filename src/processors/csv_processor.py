@@ -6,6 +6,7 @@ multiprocessing support for large datasets.
 """
 
 import csv
+import io
 import logging
 import os
 import time
@@ -16,8 +17,11 @@ from typing import Optional
 
 from tqdm import tqdm
 
-from src.utils import deduplicate_matches, merge_overlapping_matches
-from src.processors.pii_detection import analyze_text_for_pii, apply_llm_second_pass
+from src.utils import dedupe_and_merge_matches
+from src.processors.pii_detection import (
+    analyze_text_for_pii, analyze_texts_for_pii, apply_llm_second_pass,
+    release_pii_matches
+)
 
 
 @dataclass
@@ -57,40 +61,62 @@ def _process_row_worker(args: tuple) -> tuple:
     Process a single row in a worker process.
 
     Args:
-        args: Tuple of (row_idx, row_dict, text_columns)
+        args: Tuple of (row_idx, row_tuple, text_col_indices)
 
     Returns:
         Tuple of (row_idx, processed_row, pii_count, error)
     """
     global _worker_processor
-    row_idx, row, text_columns = args
+    row_idx, row, text_col_indices = args
 
     try:
         pii_count = 0
-        processed_row = row.copy()
-
-        for col in text_columns:
-            if col not in row or not row[col]:
+        # Copy-on-write: most rows contain no PII, so defer the row copy
+        # until a column actually changes
+        processed_row = None
+        row_len = len(row)
+
+        # Column validation already guaranteed the indices exist in the
+        # header; only ragged rows shorter than the header need a bounds
+        # filter, so the common case indexes straight into the row
+        if text_col_indices and row_len <= text_col_indices[-1]:
+            cols = tuple(i for i in text_col_indices if i < row_len)
+        else:
+            cols = text_col_indices
+
+        for idx in cols:
+            cell = row[idx]
+            if not cell:
                 continue
 
-            text = str(row[col])
+            # csv gives us str already; only convert non-string cells
+            text = cell if isinstance(cell, str) else str(cell)
 
             # Use shared analysis function (handles normalization and false positive filtering)
-            matches = analyze_text_for_pii(_worker_processor.analyzer, text)
+            raw_matches = analyze_text_for_pii(
+                _worker_processor.analyzer, text,
+                entities=_worker_processor.enabled_entities
+            )
 
-            if not matches:
+            if not raw_matches:
                 continue
 
             # Dedupe and merge
-            matches = deduplicate_matches(matches)
-            matches = merge_overlapping_matches(matches)
+            matches = dedupe_and_merge_matches(raw_matches)
 
             pii_count += len(matches)
 
             # Anonymize
-            processed_row[col] = _worker_processor.anonymizer.anonymize_batch(matches, text)
+            if processed_row is None:
+                processed_row = list(row)
+            processed_row[idx] = _worker_processor.anonymizer.anonymize_batch(matches, text)
+
+            # Matches are fully consumed at this point; recycle them
+            release_pii_matches(raw_matches)
 
-        return (row_idx, processed_row, pii_count, None)
+        if processed_row is not None:
+            return (row_idx, tuple(processed_row), pii_count, None)
+        return (row_idx, row, pii_count, None)
 
     except Exception as e:
         return (row_idx, row, 0, str(e))
@@ -163,27 +189,53 @@ class CSVProcessor:
             output_path = str(input_p.parent / f"{input_p.stem}_anonymized{input_p.suffix}")
         result.output_path = output_path
 
+        llm_config = self.config.get('llm_detection', {})
+        llm_enabled = llm_config.get('enabled', False)
+
         try:
-            # Read CSV
-            with open(input_path, encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                rows = list(reader)
+            with open(input_path, encoding='utf-8', newline='') as f:
+                # Positional rows (tuples) instead of dicts: no per-row key
+                # duplication, smaller multiprocessing pickle payloads, and
+                # integer indexing in the hot loop
+                reader = csv.reader(f)
+                fieldnames = next(reader, None)
+
+                if fieldnames is None:
+                    result.errors.append("CSV file is empty")
+                    return result
+
+                # Determine columns to process
+                if text_columns is None:
+                    text_columns = list(fieldnames)
+                else:
+                    # Validate columns exist
+                    missing = [c for c in text_columns if c not in fieldnames]
+                    if missing:
+                        result.errors.append(f"Columns not found: {missing}")
+                        return result
+
+                # Map column names to positional indices once, sorted so
+                # the highest index sits last for quick ragged-row checks
+                col_idx = {name: i for i, name in enumerate(fieldnames)}
+                text_col_indices = tuple(sorted(col_idx[c] for c in text_columns))
+
+                # Streaming mode: single worker and no LLM second pass means
+                # rows can flow reader -> anonymizer -> writer one at a time
+                # without materializing the whole file in memory
+                if workers <= 1 and not llm_enabled:
+                    return self._process_streaming(
+                        reader, fieldnames, text_col_indices, output_path,
+                        show_progress, result, start_time
+                    )
+
+                # Batch modes need all rows up front (multiprocessing dispatch
+                # and LLM batching both operate on the full row list)
+                rows = [tuple(row) for row in reader]
 
             if not rows:
                 result.errors.append("CSV file is empty")
                 return result
 
-            # Determine columns to process
-            if text_columns is None:
-                text_columns = list(fieldnames)
-            else:
-                # Validate columns exist
-                missing = [c for c in text_columns if c not in fieldnames]
-                if missing:
-                    result.errors.append(f"Columns not found: {missing}")
-                    return result
-
             total_rows = len(rows)
             total_pii = 0
             llm_pii = 0
@@ -194,28 +246,24 @@ class CSVProcessor:
             if workers > 1:
                 # Multiprocessing mode - Pass 1: spaCy/Presidio
                 processed_rows, total_pii, failed_rows = self._process_multiprocessing(
-                    rows, text_columns, workers, batch_size, show_progress
+                    rows, text_col_indices, workers, batch_size, show_progress
                 )
             else:
                 # Single-threaded mode - Pass 1: spaCy/Presidio
                 processed_rows, total_pii, llm_pii, failed_rows = self._process_single(
-                    rows, text_columns, show_progress
+                    rows, text_col_indices, show_progress
                 )
 
             # Pass 2: LLM second pass (runs after multiprocessing completes)
             # This preserves batching for prompt caching benefits
-            llm_config = self.config.get('llm_detection', {})
-            if llm_config.get('enabled', False) and workers > 1:
+            if llm_enabled and workers > 1:
                 processed_rows, llm_pii = self._apply_llm_pass(
-                    processed_rows, text_columns, show_progress
+                    processed_rows, text_col_indices, show_progress
                 )
                 total_pii += llm_pii
 
             # Write output
-            with open(output_path, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(processed_rows)
+            self._write_rows_batched(output_path, fieldnames, processed_rows)
 
             result.success = True
             result.rows_processed = total_rows
@@ -231,10 +279,148 @@ class CSVProcessor:
 
         return result
 
+    # Rows serialized per os.write when writing batch output
+    _WRITE_BATCH_ROWS = 4096
+
+    def _write_rows_batched(self, output_path: str, fieldnames: list, rows: list) -> None:
+        """
+        Write all rows to the output CSV in large batches.
+
+        Serializes 4096 rows at a time through csv.writer into an
+        in-memory buffer and flushes each batch with a single os.write,
+        so syscall count scales with batches rather than rows.
+
+        Args:
+            output_path: Path to output CSV file
+            fieldnames: CSV header row
+            rows: Processed rows (tuples or lists)
+        """
+        def flush(data: bytes) -> None:
+            # os.write may write less than asked; loop until drained
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fieldnames)
+
+            for start in range(0, len(rows), self._WRITE_BATCH_ROWS):
+                writer.writerows(rows[start:start + self._WRITE_BATCH_ROWS])
+                flush(buffer.getvalue().encode('utf-8'))
+                buffer.seek(0)
+                buffer.truncate()
+
+            # Header-only flush for an empty row list
+            if not rows:
+                flush(buffer.getvalue().encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def _process_streaming(
+        self,
+        reader,
+        fieldnames: list,
+        text_col_indices: tuple,
+        output_path: str,
+        show_progress: bool,
+        result: CSVProcessResult,
+        start_time: float
+    ) -> CSVProcessResult:
+        """
+        Stream rows from reader to writer one at a time.
+
+        Used when no multiprocessing or LLM batching is needed, so peak
+        memory stays constant regardless of file size.
+
+        Args:
+            reader: Open csv.reader positioned at the first data row
+            fieldnames: CSV field names
+            text_col_indices: Positional indices of columns to process
+            output_path: Path to output CSV file
+            show_progress: Show progress bar
+            result: Result object to populate
+            start_time: Processing start time
+
+        Returns:
+            Populated CSVProcessResult
+        """
+        # Peek the first row so an empty file is reported before the
+        # output file is created
+        first_row = next(reader, None)
+        if first_row is None:
+            result.errors.append("CSV file is empty")
+            return result
+
+        total_rows = 0
+        total_pii = 0
+        failed_rows = 0
+
+        def row_stream():
+            yield first_row
+            yield from reader
+
+        iterator = row_stream()
+        if show_progress:
+            iterator = tqdm(iterator, desc="Pass 1: spaCy", unit="rows")
+
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+
+            for row in iterator:
+                total_rows += 1
+                try:
+                    processed_row = None
+                    row_len = len(row)
+                    if text_col_indices and row_len <= text_col_indices[-1]:
+                        cols = tuple(i for i in text_col_indices if i < row_len)
+                    else:
+                        cols = text_col_indices
+
+                    for idx in cols:
+                        cell = row[idx]
+                        if not cell:
+                            continue
+
+                        text = cell if isinstance(cell, str) else str(cell)
+
+                        raw_matches = analyze_text_for_pii(
+                            self.processor.analyzer, text,
+                            entities=self.processor.enabled_entities
+                        )
+                        if not raw_matches:
+                            continue
+
+                        matches = dedupe_and_merge_matches(raw_matches)
+                        total_pii += len(matches)
+
+                        if processed_row is None:
+                            processed_row = list(row)
+                        processed_row[idx] = self.processor.anonymizer.anonymize_batch(matches, text)
+                        release_pii_matches(raw_matches)
+
+                    writer.writerow(processed_row if processed_row is not None else row)
+
+                except Exception:
+                    writer.writerow(row)  # Keep original on error
+                    failed_rows += 1
+
+        result.success = True
+        result.rows_processed = total_rows
+        result.rows_failed = failed_rows
+        result.total_pii_found = total_pii
+        result.processing_time = time.time() - start_time
+        result.workers_used = 1
+
+        return result
+
     def _process_single(
         self,
         rows: list,
-        text_columns: list,
+        text_col_indices: tuple,
         show_progress: bool
     ) -> tuple:
         """Process rows in single-threaded mode with optional LLM second pass."""
@@ -246,45 +432,86 @@ class CSVProcessor:
         llm_config = self.config.get('llm_detection', {})
         llm_enabled = llm_config.get('enabled', False)
 
-        # Pass 1: spaCy/Presidio detection and anonymization
-        iterator = tqdm(rows, desc="Pass 1: spaCy", unit="rows") if show_progress else rows
-
-        for row in iterator:
+        # Pass 1: spaCy/Presidio detection and anonymization. Cells are
+        # analyzed in batches through analyze_texts_for_pii so spaCy's
+        # nlp.pipe amortizes per-document overhead across cells instead
+        # of paying it once per analyze() call.
+        cells = []  # (row position, column index, cell text)
+        for row_pos, row in enumerate(rows):
+            row_len = len(row)
+            if text_col_indices and row_len <= text_col_indices[-1]:
+                cols = tuple(i for i in text_col_indices if i < row_len)
+            else:
+                cols = text_col_indices
+
+            for idx in cols:
+                cell = row[idx]
+                if not cell:
+                    continue
+                cells.append((row_pos, idx, cell if isinstance(cell, str) else str(cell)))
+
+        batch_size = self.config.get('detection', {}).get('batch_size', 64)
+        batch_starts = range(0, len(cells), batch_size)
+        if show_progress:
+            batch_starts = tqdm(batch_starts, desc="Pass 1: spaCy", unit="batch")
+
+        edited = {}  # row position -> mutable copy of the row
+        failed = set()  # row positions kept as originals
+        for start in batch_starts:
+            batch = cells[start:start + batch_size]
             try:
-                processed_row = row.copy()
-                row_pii = 0
-
-                for col in text_columns:
-                    if col not in row or not row[col]:
-                        continue
-
-                    text = str(row[col])
-
-                    # Use shared analysis function (handles normalization and false positive filtering)
-                    matches = analyze_text_for_pii(self.processor.analyzer, text)
-
-                    if not matches:
-                        continue
-
-                    matches = deduplicate_matches(matches)
-                    matches = merge_overlapping_matches(matches)
-                    row_pii += len(matches)
-
-                    # Anonymize
-                    processed_row[col] = self.processor.anonymizer.anonymize_batch(matches, text)
-
-                processed_rows.append(processed_row)
-                total_pii += row_pii
-
+                per_cell = analyze_texts_for_pii(
+                    self.processor.analyzer, [entry[2] for entry in batch],
+                    batch_size=batch_size, entities=self.processor.enabled_entities
+                )
             except Exception:
+                # Batch analysis failed; retry cell-by-cell so one bad
+                # cell only costs its own row
+                per_cell = []
+                for _, _, text in batch:
+                    try:
+                        per_cell.append(analyze_text_for_pii(
+                            self.processor.analyzer, text,
+                            entities=self.processor.enabled_entities
+                        ))
+                    except Exception:
+                        per_cell.append(None)
+
+            for (row_pos, idx, text), raw_matches in zip(batch, per_cell):
+                if raw_matches is None:
+                    failed.add(row_pos)
+                    continue
+                if not raw_matches:
+                    continue
+
+                try:
+                    matches = dedupe_and_merge_matches(raw_matches)
+                    anonymized = self.processor.anonymizer.anonymize_batch(matches, text)
+                except Exception:
+                    # Keep the whole original row on error, matching the
+                    # streaming and multiprocessing paths
+                    failed.add(row_pos)
+                    continue
+                total_pii += len(matches)
+
+                processed_row = edited.get(row_pos)
+                if processed_row is None:
+                    processed_row = edited[row_pos] = list(rows[row_pos])
+                processed_row[idx] = anonymized
+                release_pii_matches(raw_matches)
+
+        for row_pos, row in enumerate(rows):
+            if row_pos in failed:
                 processed_rows.append(row)  # Keep original on error
-                failed_rows += 1
+            else:
+                processed_rows.append(edited.get(row_pos, row))
+        failed_rows = len(failed)
 
         # Pass 2: LLM second pass (if enabled)
         llm_pii = 0
         if llm_enabled:
             processed_rows, llm_pii = self._apply_llm_pass(
-                processed_rows, text_columns, show_progress
+                processed_rows, text_col_indices, show_progress
             )
             total_pii += llm_pii
 
@@ -293,15 +520,15 @@ class CSVProcessor:
     def _apply_llm_pass(
         self,
         rows: list,
-        text_columns: list,
+        text_col_indices: tuple,
         show_progress: bool
     ) -> tuple:
         """
         Apply LLM second pass to already-processed rows.
 
         Args:
-            rows: List of row dicts (already processed by spaCy)
-            text_columns: Columns to check
+            rows: List of positional rows (already processed by spaCy)
+            text_col_indices: Positional indices of columns to check
             show_progress: Show progress bar
 
         Returns:
@@ -311,12 +538,13 @@ class CSVProcessor:
         llm_pii = 0
 
         # Collect all texts from all columns that need LLM processing
-        # Format: [(row_idx, col_name, text), ...]
+        # Format: [(row_idx, col_idx, text), ...]
         texts_to_process = []
         for row_idx, row in enumerate(rows):
-            for col in text_columns:
-                if col in row and row[col]:
-                    texts_to_process.append((row_idx, col, str(row[col])))
+            row_len = len(row)
+            for idx in text_col_indices:
+                if idx < row_len and row[idx]:
+                    texts_to_process.append((row_idx, idx, str(row[idx])))
 
         if not texts_to_process:
             return rows, 0
@@ -328,31 +556,31 @@ class CSVProcessor:
         all_llm_matches = apply_llm_second_pass(texts_only, llm_config, show_progress)
 
         # Apply LLM matches back to rows
-        for (row_idx, col, _), matches in zip(texts_to_process, all_llm_matches):
+        for (row_idx, idx, _), matches in zip(texts_to_process, all_llm_matches):
             if not matches:
                 continue
 
-            matches = deduplicate_matches(matches)
-            matches = merge_overlapping_matches(matches)
+            matches = dedupe_and_merge_matches(matches)
             llm_pii += len(matches)
 
             # Apply anonymization to the already-processed text
-            current_text = rows[row_idx][col]
-            rows[row_idx][col] = self.processor.anonymizer.anonymize_batch(matches, current_text)
+            row = list(rows[row_idx])
+            row[idx] = self.processor.anonymizer.anonymize_batch(matches, str(row[idx]))
+            rows[row_idx] = row
 
         return rows, llm_pii
 
     def _process_multiprocessing(
         self,
         rows: list,
-        text_columns: list,
+        text_col_indices: tuple,
         workers: int,
         batch_size: int,
         show_progress: bool
     ) -> tuple:
         """Process rows using multiprocessing."""
         # Prepare work items
-        work_items = [(i, row, text_columns) for i, row in enumerate(rows)]
+        work_items = [(i, row, text_col_indices) for i, row in enumerate(rows)]
 
         # Process with pool
         processed_results = [None] * len(rows)
@@ -5,27 +5,189 @@ This module coordinates the detection and anonymization pipeline for processing
 """
 
 import os
+import re
+import stat
 import time
+import copy
 import json
+import queue
+import hashlib
+import threading
+import contextlib
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-from pathlib import Path
 
-from src.models import ProcessResult, PIIMatch, AuditLogEntry
+from src.models import ProcessResult, PIIMatch
 from src.anonymizers.base_anonymizer import BaseAnonymizer
 from src.anonymizers.redactor import Redactor
 from src.anonymizers.masker import Masker
 from src.anonymizers.faker_anonymizer import FakerAnonymizer
 from src.anonymizers.hash_anonymizer import HashAnonymizer
 from src.utils import (
-    merge_overlapping_matches, deduplicate_matches,
+    dedupe_and_merge_matches,
     is_whitelisted, is_blacklisted, get_timestamp
 )
 from src.processors.pii_detection import analyze_text_for_pii
-from presidio_analyzer import RecognizerResult, Pattern
+from presidio_analyzer import RecognizerResult, Pattern, LocalRecognizer
 from presidio_analyzer.recognizer_registry import RecognizerRegistry
 from presidio_analyzer.pattern_recognizer import PatternRecognizer
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 
+# Analyzer engines shared across FileProcessor instances, keyed by language.
+# Building one means loading the spaCy model and constructing ~18 recognizers,
+# which dominates startup when many processors are created (e.g. one per
+# worker task); the engine itself is stateless across files, so reuse is safe.
+_ANALYZER_CACHE: Dict[Any, Any] = {}
+_ANALYZER_CACHE_LOCK = threading.Lock()
+
+# Per-worker FileProcessor for multiprocess directory runs; built once per
+# worker by _init_file_worker so the spaCy model loads once per process,
+# not once per file
+_worker_file_processor = None
+
+
+def _init_file_worker(config: Dict[str, Any]):
+    """
+    Initialize a worker process with its own FileProcessor.
+
+    Args:
+        config: Configuration dictionary
+    """
+    global _worker_file_processor
+    _worker_file_processor = FileProcessor(config, silent=True)
+
+
+def _process_file_worker(args: tuple):
+    """
+    Process one file in a worker process.
+
+    Args:
+        args: (input_path, output_path) tuple
+
+    Returns:
+        ProcessResult for the file
+    """
+    input_path, output_path = args
+    return _worker_file_processor.process_file(input_path, output_path)
+
+
+class DigitSpanRecognizer(LocalRecognizer):
+    r"""
+    Single-pass recognizer for bare digit sequences.
+
+    The IMEI and driver license recognizers each used to carry their own
+    low-score bare-digit patterns (\b\d{15}\b, \b\d{8}\b, \b\d{9}\b),
+    meaning three extra full scans of every document for what is one
+    question: "where are the unbroken digit runs, and how long are they?"
+    This recognizer finds all digit runs in one pass and dispatches on
+    length. Scores match the patterns it replaces - low enough that these
+    only surface when context words boost them.
+    """
+
+    # Any run of 8-20 digits; length decides which entity (if any) to emit
+    _DIGIT_RUN = re.compile(r"\b\d{8,20}\b")
+
+    # length -> (entity_type, score), mirroring the removed patterns
+    _LENGTH_DISPATCH = {
+        8: ("AU_DRIVER_LICENSE", 0.01),
+        9: ("AU_DRIVER_LICENSE", 0.01),
+        15: ("IMEI", 0.4),
+    }
+
+    # Every result this recognizer emits scores below the analysis
+    # threshold and only surfaces after a context-word boost, so if none
+    # of these substrings occur anywhere in the text no result can
+    # survive - skip the digit scan entirely. Needles are chosen so each
+    # context word above contains at least one ("lic" covers all the
+    # license/licence variants, "dl" covers DL/d/l/dl#). str.find runs at
+    # memchr speed, far cheaper than the regex pass it short-circuits.
+    _CONTEXT_NEEDLES = ("imei", "device", "handset", "phone", "lic", "drv", "dl")
+
+    def __init__(self):
+        super().__init__(
+            supported_entities=["IMEI", "AU_DRIVER_LICENSE"],
+            name="digit_span_recognizer",
+            # Union of the context lists of the recognizers whose bare
+            # patterns moved here; cross-entity boosts are harmless because
+            # lengths disambiguate and boosted scores stay below the
+            # analysis threshold for the 0.01 license patterns
+            context=["imei", "device id", "handset", "phone serial", "mobile device",
+                     "device", "driver license", "driver licence", "drivers license",
+                     "drivers licence", "driving license", "driving licence", "DL",
+                     "licence number", "license number", "licence no", "license no",
+                     "lic", "drv", "d/l", "dl#"],
+        )
+
+    def load(self) -> None:
+        """Nothing to load - the digit-run regex is a class attribute."""
+
+    def analyze(self, text, entities, nlp_artifacts=None) -> List[RecognizerResult]:
+        """
+        Find digit runs once and emit length-dispatched results.
+
+        Args:
+            text: Text to analyze
+            entities: Entity types requested by the caller
+            nlp_artifacts: Unused (regex-only recognizer)
+
+        Returns:
+            List of RecognizerResult for matching digit runs
+        """
+        lowered = text.lower()
+        if not any(needle in lowered for needle in self._CONTEXT_NEEDLES):
+            return []
+
+        results = []
+        for match in self._DIGIT_RUN.finditer(text):
+            start, end = match.span()
+            dispatch = self._LENGTH_DISPATCH.get(end - start)
+            if dispatch is None:
+                continue
+            entity_type, score = dispatch
+            if entity_type not in entities:
+                continue
+            results.append(RecognizerResult(
+                entity_type=entity_type,
+                start=start,
+                end=end,
+                score=score,
+            ))
+        return results
+
+
+class KeywordGatedPatternRecognizer(PatternRecognizer):
+    """
+    PatternRecognizer that skips its regex scans when no keyword is present.
+
+    For recognizers whose every pattern embeds a literal keyword (NTD, LOC,
+    AVC, PO Box, ...), a single C-speed substring scan over the lowercased
+    text decides whether any of the K per-pattern regex passes could
+    possibly match - the pure-Python stand-in for an Aho-Corasick keyword
+    automaton. Needles must be chosen so each pattern's required literal
+    contains at least one of them; missing a needle silently disables
+    matches, while an over-broad needle merely runs the regexes.
+    """
+
+    def __init__(self, gate_needles: List[str], **kwargs):
+        """
+        Initialize the gated recognizer.
+
+        Args:
+            gate_needles: Lowercase substrings, at least one of which must
+                occur in the text for the patterns to be scanned
+            **kwargs: Passed through to PatternRecognizer
+        """
+        super().__init__(**kwargs)
+        self._gate_needles = tuple(needle.lower() for needle in gate_needles)
+
+    def analyze(self, text, entities, nlp_artifacts=None, regex_flags=None):
+        """Scan patterns only if a gate needle occurs in the text."""
+        lowered = text.lower()
+        if not any(needle in lowered for needle in self._gate_needles):
+            return []
+        return super().analyze(text, entities, nlp_artifacts, regex_flags)
+
+
 class FileProcessor:
     """
     Processor for detecting and anonymizing PII in files.
@@ -52,10 +214,18 @@ class FileProcessor:
         self.detection_config = config.get('detection', {})
         self.anonymization_config = config.get('anonymization', {})
         self.processing_config = config.get('processing', {})
+        self.enabled_entities = self.detection_config.get('enabled_entities')
+        self.llm_config = config.get('llm_detection', {})
+        self.llm_enabled = self.llm_config.get('enabled', False)
 
         # Initialize Presidio analyzer
         self.analyzer = self._init_presidio()
 
+        # Decide once whether analysis can run without spaCy's NER pipe;
+        # _maybe_disable_ner consults this per call instead of rescanning
+        # the recognizer registry per file
+        self._ner_skip_nlp = self._resolve_ner_skip_nlp()
+
         # Initialize anonymizer
         self.anonymizer = self._init_anonymizer()
 
@@ -63,8 +233,32 @@ class FileProcessor:
         self.create_audit_log = self.processing_config.get('create_audit_log', True)
         self.backup_original = self.processing_config.get('backup_original', False)
         self.encoding = self.processing_config.get('encoding', 'utf-8')
+        self.direct_io = self.processing_config.get('direct_io', False)
+
+        # Detection results cached by content hash: duplicate files
+        # (template reports, copied email threads) are analyzed once and
+        # every later copy reuses the matches. LRU-bounded.
+        self._detection_cache: "OrderedDict[bytes, List[PIIMatch]]" = OrderedDict()
+        self._detection_cache_size = self.processing_config.get(
+            'duplicate_cache_size', 256
+        )
         self.output_suffix = self.processing_config.get('output_suffix', '_anonymized')
 
+        # Whitelist/blacklist, prepared once: literal entry lists (emails,
+        # domains, blacklist values) become frozensets so per-match checks
+        # are O(1) hash lookups instead of list scans, and regex patterns
+        # are compiled here so filtering never touches the re compile
+        # cache. is_whitelisted/is_blacklisted accept these unchanged.
+        self.whitelist = dict(config.get('whitelist') or {})
+        for literal_key in ('emails', 'domains'):
+            if self.whitelist.get(literal_key):
+                self.whitelist[literal_key] = frozenset(self.whitelist[literal_key])
+        if self.whitelist.get('patterns'):
+            self.whitelist['patterns'] = [
+                re.compile(pattern) for pattern in self.whitelist['patterns']
+            ]
+        self.blacklist = frozenset(config.get('blacklist') or [])
+
     def _init_presidio(self):
         """
         Initialize Presidio AnalyzerEngine.
@@ -72,6 +266,32 @@ class FileProcessor:
         Returns:
             AnalyzerEngine instance or None
         """
+        language = self.detection_config.get('language', 'en')
+        model_name = self.detection_config.get('spacy_model', 'en_core_web_lg')
+
+        # Reuse a previously built engine for this language/model if one
+        # exists. The lock keeps two threads constructing FileProcessors
+        # concurrently from both paying the spaCy load for the same key.
+        with _ANALYZER_CACHE_LOCK:
+            return self._init_presidio_locked(language, model_name)
+
+    def _init_presidio_locked(self, language: str, model_name: str):
+        """
+        Build or fetch the cached AnalyzerEngine; caller holds the cache lock.
+
+        Args:
+            language: Language code for the NLP engine
+            model_name: spaCy model to load
+
+        Returns:
+            AnalyzerEngine instance or None
+        """
+        cached = _ANALYZER_CACHE.get((language, model_name))
+        if cached is not None:
+            if not self.silent:
+                print(f"✓ Presidio initialized (language: {language}, model: {model_name}, cached)")
+            return cached
+
         try:
             import logging
             from presidio_analyzer import AnalyzerEngine
@@ -83,17 +303,41 @@ class FileProcessor:
                 AuMedicareRecognizer, AuTfnRecognizer, AuAbnRecognizer, AuAcnRecognizer
             )
 
-            language = self.detection_config.get('language', 'en')
-
-            # Configure NLP engine
+            # Optionally run the spaCy pipeline on GPU. Must happen before
+            # the engine is created so thinc allocates model weights there.
+            if self.detection_config.get('use_gpu', False):
+                try:
+                    import spacy
+                    spacy.require_gpu()
+                    if not self.silent:
+                        print("✓ spaCy GPU enabled")
+                except Exception as e:
+                    print(f"Warning: GPU requested but unavailable ({e}), falling back to CPU")
+
+            # Configure NLP engine. The model is configurable so operators
+            # can trade accuracy for speed (en_core_web_sm is ~2-3x faster
+            # with ~5x smaller RSS); the packaged default stays lg since
+            # that's what the distribution bundles.
             nlp_configuration = {
                 "nlp_engine_name": "spacy",
-                "models": [{"lang_code": language, "model_name": "en_core_web_lg"}],
+                "models": [{"lang_code": language, "model_name": model_name}],
             }
 
             provider = NlpEngineProvider(nlp_configuration=nlp_configuration)
             nlp_engine = provider.create_engine()
-            nlp_engine.nlp["en"].max_length = 20000000
+            # No max_length bump: oversized texts are chunked before
+            # analysis (see pii_detection._chunk_text), which keeps peak
+            # memory bounded instead of letting spaCy build one giant Doc
+
+            # PII detection needs tokenization + NER plus lemmas for context
+            # boosting (tagger/attribute_ruler/lemmatizer stay enabled: the
+            # DOB/IMEI/license recognizers boost low-score matches via lemma
+            # keywords). The dependency parser feeds nothing downstream, so
+            # drop it - it's the single most expensive unused component.
+            try:
+                nlp_engine.nlp[language].disable_pipe("parser")
+            except KeyError:
+                pass  # Model has no parser component
 
             registry = RecognizerRegistry()
 
@@ -149,6 +393,15 @@ class FileProcessor:
             registry.add_recognizer(passport_recognizer)
             registry.add_recognizer(centrelink_recognizer)
 
+            # Shared single-pass scan for bare digit runs (IMEI, bare DL)
+            registry.add_recognizer(DigitSpanRecognizer())
+
+            # Compile every pattern regex up front. Presidio compiles lazily
+            # inside analyze() and caches on the Pattern, so without this the
+            # first document pays ~60 compiles; the engine is shared (see
+            # _ANALYZER_CACHE), so precompiling here makes the cost one-time
+            # at init rather than on the first file's latency.
+            self._precompile_registry_patterns(registry)
 
             # Create analyzer with custom registry
             analyzer = AnalyzerEngine(
@@ -156,8 +409,10 @@ class FileProcessor:
                 registry=registry
             )
 
+            _ANALYZER_CACHE[(language, model_name)] = analyzer
+
             if not self.silent:
-                print(f"✓ Presidio initialized (language: {language})")
+                print(f"✓ Presidio initialized (language: {language}, model: {model_name})")
             return analyzer
 
         except ImportError:
@@ -168,6 +423,74 @@ class FileProcessor:
             print(f"✗ Error initializing Presidio: {e}")
             return None
 
+    def _maybe_disable_ner(self):
+        """
+        Context manager that drops spaCy's NER when no requested entity needs it.
+
+        NER (with its tok2vec encoding) is the bulk of per-document analysis
+        cost, but it only feeds the spaCy-backed entities (PERSON, LOCATION,
+        ORGANIZATION, NRP, ...). When detection.enabled_entities is set and
+        contains none of those, disable the ner pipe for the duration of the
+        analysis call. The tagger/lemmatizer stay on - context boosting for
+        the low-score pattern recognizers runs on lemmas.
+
+        Returns:
+            Context manager (no-op when NER is needed or unavailable)
+        """
+        if self._ner_skip_nlp is None:
+            return contextlib.nullcontext()
+        return self._ner_skip_nlp.select_pipes(disable=["ner"])
+
+    def _resolve_ner_skip_nlp(self):
+        """
+        Work out once whether NER can be dropped, and on which pipeline.
+
+        Returns:
+            The spaCy Language whose ner pipe should be disabled during
+            analysis, or None when NER is needed or unavailable
+        """
+        if not self.enabled_entities or not self.analyzer:
+            return None
+
+        ner_entities = set()
+        for recognizer in self.analyzer.registry.recognizers:
+            if type(recognizer).__name__ == "SpacyRecognizer":
+                ner_entities.update(recognizer.supported_entities)
+
+        if ner_entities & set(self.enabled_entities):
+            return None
+
+        language = self.detection_config.get('language', 'en')
+        nlp = self.analyzer.nlp_engine.nlp.get(language)
+        if nlp is None or "ner" not in nlp.pipe_names:
+            return None
+        return nlp
+
+    @staticmethod
+    def _precompile_registry_patterns(registry) -> None:
+        """
+        Eagerly compile the regex of every pattern recognizer in a registry.
+
+        Mirrors what PatternRecognizer.analyze does lazily (same regex
+        module, same per-recognizer flags) so the compiled object is accepted
+        by its cache check and nothing recompiles at analysis time.
+
+        Args:
+            registry: RecognizerRegistry whose recognizers should be compiled
+        """
+        import regex
+
+        for recognizer in registry.recognizers:
+            patterns = getattr(recognizer, "patterns", None)
+            if not patterns:
+                continue
+            flags = getattr(recognizer, "global_regex_flags", None)
+            if flags is None:
+                continue
+            for pattern in patterns:
+                if pattern.compiled_regex is None or pattern.compiled_with_flags != flags:
+                    pattern.compiled_regex = regex.compile(pattern.regex, flags=flags)
+                    pattern.compiled_with_flags = flags
 
     def _create_australian_phone_recognizer(self) -> PatternRecognizer:
         """Create custom recognizer for Australian phone numbers."""
@@ -250,38 +573,80 @@ class FileProcessor:
         Only matches dates when DOB-related keywords are nearby.
         This prevents matching meeting dates, timestamps, etc.
         """
+        # Shared date tails. Prefix literals are split into separate patterns
+        # (one fixed word each, no leading alternation) so the regex engine
+        # can use its literal-prefix fast path; capture groups are omitted
+        # since only the full match span is used.
+        numeric_date = r'\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}'
+        written_date = (
+            r'\d{1,2}(?:st|nd|rd|th)?\s+'
+            r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?'
+            r'|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{2,4}'
+        )
+
         dob_patterns = [
             # High confidence: explicit DOB context prefix
+            # d\.?o\.?b\.? covers "dob", "d.o.b" and "d.o.b."
+            Pattern(
+                name="dob_abbrev_prefix",
+                regex=rf'(?i)\bd\.?o\.?b\.?[:\s]+{numeric_date}',
+                score=0.95
+            ),
+            Pattern(
+                name="dob_date_of_birth_prefix",
+                regex=rf'(?i)\bdate\s*of\s*birth[:\s]+{numeric_date}',
+                score=0.95
+            ),
+            Pattern(
+                name="dob_birth_date_prefix",
+                regex=rf'(?i)\bbirth\s*date[:\s]+{numeric_date}',
+                score=0.95
+            ),
+            Pattern(
+                name="dob_born_prefix",
+                regex=rf'(?i)\bborn[:\s]+{numeric_date}',
+                score=0.95
+            ),
+            Pattern(
+                name="dob_abbrev_prefix_written",
+                regex=rf'(?i)\bd\.?o\.?b\.?[:\s]+{written_date}',
+                score=0.95
+            ),
             Pattern(
-                name="dob_with_prefix",
-                regex=r'(?i)(?:dob|d\.o\.b\.?|date\s*of\s*birth|birth\s*date|born)[:\s]+(\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4})',
+                name="dob_date_of_birth_prefix_written",
+                regex=rf'(?i)\bdate\s*of\s*birth[:\s]+{written_date}',
                 score=0.95
             ),
             Pattern(
-                name="dob_written_with_prefix",
-                regex=r'(?i)(?:dob|d\.o\.b\.?|date\s*of\s*birth|birth\s*date|born)[:\s]+(\d{1,2})(?:st|nd|rd|th)?\s+(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{2,4}',
+                name="dob_birth_date_prefix_written",
+                regex=rf'(?i)\bbirth\s*date[:\s]+{written_date}',
+                score=0.95
+            ),
+            Pattern(
+                name="dob_born_prefix_written",
+                regex=rf'(?i)\bborn[:\s]+{written_date}',
                 score=0.95
             ),
             # Low confidence bare dates - REQUIRE context keywords to boost above threshold
             # These won't match on their own (score 0.3 < threshold 0.7)
             Pattern(
                 name="dob_ddmmyyyy_slash",
-                regex=r'\b(0?[1-9]|[12][0-9]|3[01])\/(0?[1-9]|1[0-2])\/(19|20)\d{2}\b',
+                regex=r'\b(?:0?[1-9]|[12][0-9]|3[01])\/(?:0?[1-9]|1[0-2])\/(?:19|20)\d{2}\b',
                 score=0.3
             ),
             Pattern(
                 name="dob_ddmmyyyy_dash",
-                regex=r'\b(0?[1-9]|[12][0-9]|3[01])-(0?[1-9]|1[0-2])-(19|20)\d{2}\b',
+                regex=r'\b(?:0?[1-9]|[12][0-9]|3[01])-(?:0?[1-9]|1[0-2])-(?:19|20)\d{2}\b',
                 score=0.3
             ),
             Pattern(
                 name="dob_iso_format",
-                regex=r'\b(19|20)\d{2}-(0?[1-9]|1[0-2])-(0?[1-9]|[12][0-9]|3[01])\b',
+                regex=r'\b(?:19|20)\d{2}-(?:0?[1-9]|1[0-2])-(?:0?[1-9]|[12][0-9]|3[01])\b',
                 score=0.3
             ),
             Pattern(
                 name="dob_written_long",
-                regex=r'(?i)\b(\d{1,2})(?:st|nd|rd|th)?\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(19|20)\d{2}\b',
+                regex=r'(?i)\b\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+(?:19|20)\d{2}\b',
                 score=0.3
             ),
         ]
@@ -295,24 +660,30 @@ class FileProcessor:
 
     def _create_enhanced_address_recognizer(self) -> PatternRecognizer:
         """Create enhanced address recognizer for Australian addresses."""
-        # Australian address patterns
+        # Australian address patterns. Word runs use possessive quantifiers
+        # ([A-Za-z]{1,20}+, \s++) so the engine never re-splits a word/space
+        # boundary while backtracking - only the word COUNT ({1,5} etc.) can
+        # backtrack, which is what lets the street-type word be given back.
+        # This bounds worst-case matching to linear time on adversarial input.
+        street_words = r"(?:[A-Za-z]{1,20}+\s++){1,5}"
+        street_types = r"(Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Lane|Ln|Boulevard|Blvd|Circuit|Cct|Court|Ct|Place|Pl|Way|Crescent|Cres)"
         australian_address_patterns = [
             # Full address with state and postcode
             Pattern(
                 name="australian_street_address",
-                regex=r"\b\d{1,3}\s+(?:[A-Za-z]+\s+){1,5}(Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Lane|Ln|Boulevard|Blvd|Circuit|Cct|Court|Ct|Place|Pl|Way|Crescent|Cres)\b,?\s*(?:[A-Za-z]+\s+){1,3}(NSW|VIC|QLD|WA|SA|TAS|ACT|NT)\s+\d{4}\b",
+                regex=rf"\b\d{{1,3}}\s++{street_words}{street_types}\b,?\s*+(?:[A-Za-z]{{1,20}}+\s++){{1,3}}(NSW|VIC|QLD|WA|SA|TAS|ACT|NT)\s++\d{{4}}\b",
                 score=0.95
             ),
             # Street address with suburb (no state/postcode)
             Pattern(
                 name="australian_street_with_suburb",
-                regex=r"\b\d{1,3}\s+(?:[A-Za-z]+\s+){1,5}(Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Lane|Ln|Boulevard|Blvd|Circuit|Cct|Court|Ct|Place|Pl|Way|Crescent|Cres)\b,?\s+[A-Za-z]+(?:\s+[A-Za-z]+){0,2}\b",
+                regex=rf"\b\d{{1,3}}\s++{street_words}{street_types}\b,?\s++[A-Za-z]{{1,20}}+(?:\s++[A-Za-z]{{1,20}}+){{0,2}}\b",
                 score=0.8
             ),
             # Simple street address only
             Pattern(
                 name="australian_street_simple",
-                regex=r"\b\d{1,3}\s+(?:[A-Za-z]+\s+){1,5}(Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Lane|Ln|Boulevard|Blvd|Circuit|Cct|Court|Ct|Place|Pl|Way|Crescent|Cres)\b",
+                regex=rf"\b\d{{1,3}}\s++{street_words}{street_types}\b",
                 score=0.7
             )
         ]
@@ -347,7 +718,8 @@ class FileProcessor:
             )
         ]
 
-        return PatternRecognizer(
+        return KeywordGatedPatternRecognizer(
+            gate_needles=["loc"],
             supported_entity="AU_NBN_LOC_ID",
             patterns=nbn_loc_patterns,
             name="nbn_location_id_recognizer",
@@ -379,7 +751,10 @@ class FileProcessor:
             )
         ]
 
-        return PatternRecognizer(
+        return KeywordGatedPatternRecognizer(
+            # "class" covers the spelled-out "Service Class NN" branch,
+            # which contains no "sc" substring
+            gate_needles=["avc", "cvc", "poi", "sc", "class"],
             supported_entity="AU_NBN_SERVICE_ID",
             patterns=nbn_service_patterns,
             name="nbn_service_id_recognizer",
@@ -443,7 +818,10 @@ class FileProcessor:
             ),
             Pattern(
                 name="po_box_full_address",
-                regex=r"(?i)\b(?:P\.?\s*O\.?\s*Box|GPO\s*Box)\s+\d{1,6}\s*,?\s*[A-Za-z][A-Za-z\s]{2,25}\s+(?:NSW|VIC|QLD|WA|SA|TAS|ACT|NT)\s+\d{4}\b",
+                # Suburb as bounded words rather than [A-Za-z\s]{2,25}, which
+                # overlapped the following \s+ and state letters and could
+                # backtrack quadratically on long space runs
+                regex=r"(?i)\b(?:P\.?\s*O\.?\s*Box|GPO\s*Box)\s++\d{1,6}\s*+,?\s*+[A-Za-z]{1,20}+(?:\s++[A-Za-z]{1,20}+){0,2}\s++(?:NSW|VIC|QLD|WA|SA|TAS|ACT|NT)\s++\d{4}\b",
                 score=0.95
             ),
             Pattern(
@@ -453,7 +831,8 @@ class FileProcessor:
             )
         ]
 
-        return PatternRecognizer(
+        return KeywordGatedPatternRecognizer(
+            gate_needles=["box", "bag", "cmb", "rmb", "rsd", "ms"],
             supported_entity="AU_PO_BOX",
             patterns=po_box_patterns,
             name="po_box_recognizer",
@@ -467,15 +846,21 @@ class FileProcessor:
     def _create_imei_recognizer(self) -> PatternRecognizer:
         """Create recognizer for IMEI numbers."""
         imei_patterns = [
+            # One fixed context word per pattern so each gets a literal prefix
             Pattern(
                 name="imei_with_context",
-                regex=r"(?i)(?:imei|device\s*id|handset)[:\s#]*(\d{15,17})",
+                regex=r"(?i)\bimei[:\s#]*\d{15,17}",
+                score=0.95
+            ),
+            Pattern(
+                name="imei_device_id_context",
+                regex=r"(?i)\bdevice\s*id[:\s#]*\d{15,17}",
                 score=0.95
             ),
             Pattern(
-                name="imei_15_digit",
-                regex=r"\b\d{15}\b",
-                score=0.4  # Low without context - could be other long number
+                name="imei_handset_context",
+                regex=r"(?i)\bhandset[:\s#]*\d{15,17}",
+                score=0.95
             ),
             Pattern(
                 name="imei_formatted",
@@ -494,10 +879,16 @@ class FileProcessor:
     def _create_iccid_recognizer(self) -> PatternRecognizer:
         """Create recognizer for ICCID (SIM card) numbers."""
         iccid_patterns = [
-            # With explicit context (highest confidence)
+            # With explicit context (highest confidence); "sim" also covers
+            # the "sim card"/"sim number" phrasings via an optional tail
             Pattern(
                 name="iccid_with_context",
-                regex=r"(?i)(?:iccid|sim|sim\s*card|sim\s*number)[:\s#]*(89\d{17,19})",
+                regex=r"(?i)\biccid[:\s#]*89\d{17,19}",
+                score=0.95
+            ),
+            Pattern(
+                name="iccid_sim_context",
+                regex=r"(?i)\bsim(?:\s*card|\s*number)?[:\s#]*89\d{17,19}",
                 score=0.95
             ),
             # All ICCIDs start with 89 (covers Australian 8961/8964 prefixes)
@@ -520,7 +911,7 @@ class FileProcessor:
         ntd_patterns = [
             Pattern(
                 name="ntd_prefixed",
-                regex=r"(?i)\bNTD[-\s]?([A-Z0-9]{8,16})\b",
+                regex=r"(?i)\bNTD[-\s]?[A-Z0-9]{8,16}\b",
                 score=0.9
             ),
             Pattern(
@@ -540,12 +931,31 @@ class FileProcessor:
             ),
             Pattern(
                 name="ntd_with_context",
-                regex=r"(?i)(?:ntd|network\s*termination|connection\s*box|nbn\s*device)[:\s#]*([A-Z0-9]{8,16})",
+                regex=r"(?i)\bntd[:\s#]*[A-Z0-9]{8,16}",
+                score=0.95
+            ),
+            Pattern(
+                name="ntd_network_termination_context",
+                regex=r"(?i)\bnetwork\s*termination[:\s#]*[A-Z0-9]{8,16}",
+                score=0.95
+            ),
+            Pattern(
+                name="ntd_connection_box_context",
+                regex=r"(?i)\bconnection\s*box[:\s#]*[A-Z0-9]{8,16}",
+                score=0.95
+            ),
+            Pattern(
+                name="ntd_nbn_device_context",
+                regex=r"(?i)\bnbn\s*device[:\s#]*[A-Z0-9]{8,16}",
                 score=0.95
             )
         ]
 
-        return PatternRecognizer(
+        return KeywordGatedPatternRecognizer(
+            # noka/alcl/2m/3m cover the vendor-serial patterns that carry
+            # no ntd/network/connection/nbn keyword of their own
+            gate_needles=["ntd", "network", "connection", "nbn",
+                          "noka", "alcl", "2m", "3m"],
             supported_entity="AU_NTD_SERIAL",
             patterns=ntd_patterns,
             name="ntd_serial_recognizer",
@@ -573,7 +983,7 @@ class FileProcessor:
             # These have context baked into the regex itself
             Pattern(
                 name="au_dl_with_context",
-                regex=r"(?i)(?:driver[']?s?\s*licen[cs]e|DL|licen[cs]e\s*(?:no|number|num|#))[:\s#]*([A-Za-z]?\d{6,9})",
+                regex=r"(?i)(?:driver[']?s?\s*+licen[cs]e|DL|licen[cs]e\s*+(?:no|number|num|#))[:\s#]*+([A-Za-z]?\d{6,9})",
                 score=0.9
             ),
             Pattern(
@@ -608,20 +1018,8 @@ class FileProcessor:
                 score=0.4
             ),
 
-            # === LOW CONFIDENCE: Bare digit patterns ===
-            # These REQUIRE context keywords to be useful
-            # NSW/QLD: 8 digits
-            Pattern(
-                name="au_dl_8digit",
-                regex=r"\b\d{8}\b",
-                score=0.01
-            ),
-            # VIC/QLD: 9 digits
-            Pattern(
-                name="au_dl_9digit",
-                regex=r"\b\d{9}\b",
-                score=0.01
-            ),
+            # Bare 8/9-digit runs are handled by DigitSpanRecognizer in a
+            # single shared pass (still score 0.01 + context boost)
         ]
 
         return PatternRecognizer(
@@ -749,75 +1147,28 @@ class FileProcessor:
         result = ProcessResult(success=False, input_path=input_path)
 
         try:
-            # Validate input file
-            if not os.path.exists(input_path):
-                result.add_error(f"Input file not found: {input_path}")
+            # Very large files stream window-by-window instead of being
+            # held (and anonymized) fully in memory
+            stream_threshold = self.processing_config.get(
+                'stream_threshold_bytes', 16 * 1024 * 1024
+            )
+            try:
+                input_size = os.path.getsize(input_path)
+            except OSError:
+                input_size = -1  # missing file: fall through to _prepare_file's error
+            if input_size >= stream_threshold:
+                self._process_file_streaming(result, input_path, output_path)
                 return result
 
-            if not os.path.isfile(input_path):
-                result.add_error(f"Input path is not a file: {input_path}")
+            text, output_path = self._prepare_file(result, input_path, output_path)
+            if text is None:
                 return result
 
-            # Generate output path if not provided
-            if output_path is None:
-                output_path = self._generate_output_path(input_path)
-
-            result.output_path = output_path
-
-            # Backup original if configured
-            if self.backup_original:
-                self._backup_file(input_path)
-
-            # Read input file
-            print(f"Reading file: {input_path}")
-            text = self._read_file(input_path)
-
             # Detect PII
             print("Detecting PII...")
             matches = self._detect_all_pii(text)
-            result.pii_found = len(matches)
-            result.matches = matches
-
-            print(f"Found {len(matches)} PII instances")
-
-            # Apply whitelist/blacklist filtering
-            matches = self._apply_filters(matches)
-
-            # Deduplicate and merge overlapping matches
-            matches = deduplicate_matches(matches)
-            matches = merge_overlapping_matches(matches)
-
-            # Anonymize text (Pass 1: spaCy/Presidio)
-            print("Anonymizing PII...")
-            anonymized_text = self.anonymizer.anonymize_batch(matches, text)
-            result.pii_anonymized = len(matches)
-
-            # Pass 2: LLM second pass (if enabled)
-            llm_config = self.config.get('llm_detection', {})
-            if llm_config.get('enabled', False):
-                print("Running LLM second pass...")
-                llm_matches = self._detect_llm_pii(anonymized_text)
-                if llm_matches:
-                    print(f"  LLM: found {len(llm_matches)} additional PII instances")
-                    llm_matches = deduplicate_matches(llm_matches)
-                    llm_matches = merge_overlapping_matches(llm_matches)
-                    anonymized_text = self.anonymizer.anonymize_batch(llm_matches, anonymized_text)
-                    result.llm_pii_found = len(llm_matches)
-                    result.pii_anonymized += len(llm_matches)
-                    result.matches.extend(llm_matches)
-
-            # Write output file
-            print(f"Writing output: {output_path}")
-            self._write_file(output_path, anonymized_text)
-
-            # Generate audit log if configured
-            if self.create_audit_log:
-                audit_path = self._generate_audit_path(output_path)
-                self._write_audit_log(audit_path, matches)
-                print(f"Audit log written: {audit_path}")
 
-            result.success = True
-            print("Processing completed successfully")
+            self._finish_file(result, text, matches, output_path)
 
         except Exception as e:
             result.add_error(f"Error processing file: {str(e)}")
@@ -828,19 +1179,452 @@ class FileProcessor:
 
         return result
 
+    # Target window size for streaming large files (readlines hint, so
+    # windows always end on a line boundary)
+    _STREAM_WINDOW_BYTES = 4 * 1024 * 1024
+
+    def _process_file_streaming(self, result: ProcessResult, input_path: str,
+                                output_path: Optional[str]) -> None:
+        """
+        Process a large file in line-aligned windows.
+
+        Reads ~4MB at a time, runs the full detect/filter/anonymize
+        pipeline on each window, and appends the anonymized window to the
+        output - peak memory stays proportional to the window, not the
+        file. Windows end on line boundaries, so a PII value on a single
+        line is never split; multi-line entities spanning a window edge
+        can be missed, which matches the line-oriented log files this
+        path is meant for.
+
+        Args:
+            result: Result object to populate
+            input_path: Path to input file
+            output_path: Path to output file (auto-generated if None)
+        """
+        if output_path is None:
+            output_path = self._generate_output_path(input_path)
+        result.output_path = output_path
+
+        if self.backup_original:
+            self._backup_file(input_path)
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        llm_config = self.llm_config
+        llm_enabled = self.llm_enabled
+
+        print(f"Streaming file: {input_path}")
+        all_kept: List[PIIMatch] = []
+        offset = 0
+
+        with open(input_path, 'r', encoding=self.encoding) as fin, \
+                open(output_path, 'w', encoding=self.encoding) as fout:
+            while True:
+                lines = fin.readlines(self._STREAM_WINDOW_BYTES)
+                if not lines:
+                    break
+                window = ''.join(lines)
+
+                matches = self._detect_all_pii(window)
+                result.pii_found += len(matches)
+
+                kept = self._apply_filters(matches)
+                kept = dedupe_and_merge_matches(kept)
+
+                anonymized = self.anonymizer.anonymize_batch(kept, window)
+                result.pii_anonymized += len(kept)
+
+                if llm_enabled:
+                    llm_matches = self._detect_llm_pii(anonymized)
+                    if llm_matches:
+                        llm_matches = dedupe_and_merge_matches(llm_matches)
+                        anonymized = self.anonymizer.anonymize_batch(llm_matches, anonymized)
+                        result.llm_pii_found += len(llm_matches)
+                        result.pii_anonymized += len(llm_matches)
+                        kept = kept + llm_matches
+
+                fout.write(anonymized)
+
+                # Shift to absolute positions for the audit log
+                if offset:
+                    for match in kept:
+                        match.start += offset
+                        match.end += offset
+                all_kept.extend(kept)
+                offset += len(window)
+
+        result.matches = all_kept
+        print(f"Found {result.pii_found} PII instances")
+
+        if self.create_audit_log:
+            audit_path = self._generate_audit_path(output_path)
+            self._write_audit_log(audit_path, all_kept)
+            print(f"Audit log written: {audit_path}")
+
+        result.success = True
+        print("Processing completed successfully")
+
+    def _prepare_file(self, result: ProcessResult, input_path: str, output_path: Optional[str]) -> tuple:
+        """
+        Validate input, resolve the output path, back up, and read the file.
+
+        Args:
+            result: Result object to record errors/output path on
+            input_path: Path to input file
+            output_path: Path to output file (auto-generated if None)
+
+        Returns:
+            Tuple of (text, output_path); text is None when validation failed
+        """
+        # Validate input file with a single stat call instead of
+        # exists + isfile (two syscalls - noticeable on networked FS)
+        try:
+            mode = os.stat(input_path).st_mode
+        except OSError:
+            result.add_error(f"Input file not found: {input_path}")
+            return None, None
+
+        if not stat.S_ISREG(mode):
+            result.add_error(f"Input path is not a file: {input_path}")
+            return None, None
+
+        # Generate output path if not provided
+        if output_path is None:
+            output_path = self._generate_output_path(input_path)
+
+        result.output_path = output_path
+
+        # Backup original if configured
+        if self.backup_original:
+            self._backup_file(input_path)
+
+        # Read input file
+        print(f"Reading file: {input_path}")
+        text = self._read_file(input_path)
+
+        return text, output_path
+
+    def _finish_file(self, result: ProcessResult, text: str, matches: List[PIIMatch], output_path: str) -> None:
+        """
+        Filter, anonymize, write output, and record results for one file.
+
+        Shared tail of the pipeline between process_file and process_files;
+        runs the LLM second pass (when enabled) for this file alone. The
+        batched pipeline instead collects anonymized texts and calls the
+        LLM once per group - see process_files.
+
+        Args:
+            result: Result object to populate
+            text: Original file content
+            matches: Detected PII matches
+            output_path: Path to write anonymized output to
+        """
+        anonymized_text, kept = self._anonymize_pass(result, text, matches)
+
+        llm_matches: List[PIIMatch] = []
+        if self.llm_enabled:
+            print("Running LLM second pass...")
+            llm_matches = self._detect_llm_pii(anonymized_text)
+
+        self._apply_llm_and_write(result, anonymized_text, llm_matches, kept, output_path)
+
+    def _anonymize_pass(self, result: ProcessResult, text: str,
+                        matches: List[PIIMatch]) -> tuple:
+        """
+        Filter, merge, and anonymize the Presidio matches for one file.
+
+        Args:
+            result: Result object to populate
+            text: Original file content
+            matches: Detected PII matches
+
+        Returns:
+            Tuple of (anonymized_text, kept_matches)
+        """
+        result.pii_found = len(matches)
+        result.matches = matches
+
+        print(f"Found {len(matches)} PII instances")
+
+        # Apply whitelist/blacklist filtering
+        matches = self._apply_filters(matches)
+
+        # Deduplicate and merge overlapping matches in one pass
+        matches = dedupe_and_merge_matches(matches)
+
+        # Anonymize text (Pass 1: spaCy/Presidio)
+        print("Anonymizing PII...")
+        anonymized_text = self.anonymizer.anonymize_batch(matches, text)
+        result.pii_anonymized = len(matches)
+
+        return anonymized_text, matches
+
+    def _apply_llm_and_write(self, result: ProcessResult, anonymized_text: str,
+                             llm_matches: List[PIIMatch], kept_matches: List[PIIMatch],
+                             output_path: str) -> None:
+        """
+        Apply LLM second-pass matches, write output, and finalize the result.
+
+        Args:
+            result: Result object to populate
+            anonymized_text: Text after the Presidio anonymization pass
+            llm_matches: Matches from the LLM second pass (may be empty)
+            kept_matches: Merged Presidio matches (for the audit log)
+            output_path: Path to write anonymized output to
+        """
+        # Write output file
+        print(f"Writing output: {output_path}")
+        if llm_matches:
+            print(f"  LLM: found {len(llm_matches)} additional PII instances")
+            llm_matches = dedupe_and_merge_matches(llm_matches)
+            result.llm_pii_found = len(llm_matches)
+            result.pii_anonymized += len(llm_matches)
+            result.matches.extend(llm_matches)
+            # Stream the second-pass replacement pieces straight to disk
+            # instead of materializing another full copy of the text
+            self._write_file_parts(
+                output_path,
+                self.anonymizer.iter_anonymized_parts(llm_matches, anonymized_text)
+            )
+        else:
+            self._write_file(output_path, anonymized_text)
+
+        # Generate audit log if configured
+        if self.create_audit_log:
+            audit_path = self._generate_audit_path(output_path)
+            self._write_audit_log(audit_path, kept_matches)
+            print(f"Audit log written: {audit_path}")
+
+        result.success = True
+        print("Processing completed successfully")
+
+    def process_files(
+        self,
+        input_paths: List[str],
+        output_paths: Optional[List[str]] = None,
+        batch_size: int = 16
+    ) -> List[ProcessResult]:
+        """
+        Process multiple files through a read -> analyze -> write pipeline.
+
+        Files are read and prepared by a reader thread, analyzed in batches
+        on the calling thread (one hot analyzer; spaCy's nlp.pipe amortizes
+        pipeline overhead across documents), and finished/written by a
+        writer thread. Queues are bounded so read-ahead is limited and the
+        stages overlap: file I/O on both sides runs concurrently with
+        analysis. Typically 2-4x faster than calling process_file per file
+        on corpora of small files.
+
+        Args:
+            input_paths: Paths to input files
+            output_paths: Matching output paths (auto-generated if None)
+            batch_size: Files analyzed per spaCy batch
+                (processing.queue_depth bounds batches in flight per stage)
+
+        Returns:
+            List of ProcessResult objects, one per input path
+        """
+        from src.processors.pii_detection import analyze_texts_for_pii
+
+        batch_size = self.detection_config.get('batch_size', batch_size)
+        queue_depth = self.processing_config.get('queue_depth', 2)
+
+        if output_paths is None:
+            output_paths = [None] * len(input_paths)
+        path_pairs = list(zip(input_paths, output_paths))
+
+        groups = [
+            path_pairs[group_start:group_start + batch_size]
+            for group_start in range(0, len(path_pairs), batch_size)
+        ]
+        results_by_group: List[Optional[List[ProcessResult]]] = [None] * len(groups)
+
+        read_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        write_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+
+        def read_stage():
+            """Read and prepare each group, then signal completion."""
+            for group_index, group in enumerate(groups):
+                prepared = []  # (result, text, output_path)
+                group_results = []
+                for input_path, requested_output in group:
+                    start_time = time.time()
+                    result = ProcessResult(success=False, input_path=input_path)
+                    group_results.append(result)
+                    try:
+                        text, output_path = self._prepare_file(result, input_path, requested_output)
+                        if text is not None:
+                            prepared.append((result, text, output_path))
+                    except Exception as e:
+                        result.add_error(f"Error processing file: {str(e)}")
+                    result.processing_time = time.time() - start_time
+                read_queue.put((group_index, group_results, prepared))
+            read_queue.put(None)
+
+        llm_config = self.llm_config
+        llm_enabled = self.llm_enabled
+
+        def write_stage():
+            """Finish analyzed files (filter, anonymize, write, audit)."""
+            from src.processors.pii_detection import apply_llm_second_pass
+
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    break
+                prepared, matches_per_text, analysis_share = item
+
+                # First anonymization pass for every file in the group
+                staged = []  # (result, anonymized_text, kept, output_path, finish_start)
+                for (result, text, output_path), matches in zip(prepared, matches_per_text):
+                    finish_start = time.time()
+                    try:
+                        anonymized_text, kept = self._anonymize_pass(result, text, matches)
+                        staged.append((result, anonymized_text, kept, output_path, finish_start))
+                    except Exception as e:
+                        result.add_error(f"Error processing file: {str(e)}")
+                        print(f"Error: {e}")
+                        result.processing_time += analysis_share + (time.time() - finish_start)
+
+                # The originals aren't needed past the first pass; drop the
+                # group's worth of them before the LLM pass and writes so
+                # peak memory holds one set of texts, not two
+                del prepared, matches_per_text, item
+
+                # One LLM call for the whole group instead of one per file -
+                # the concurrent client fans the texts out under a single
+                # event loop and shared connection pool
+                if llm_enabled and staged:
+                    print("Running LLM second pass...")
+                    llm_per_text = apply_llm_second_pass(
+                        [entry[1] for entry in staged], llm_config
+                    )
+                else:
+                    llm_per_text = [[] for _ in staged]
+
+                for (result, anonymized_text, kept, output_path, finish_start), llm_matches \
+                        in zip(staged, llm_per_text):
+                    try:
+                        self._apply_llm_and_write(
+                            result, anonymized_text, llm_matches, kept, output_path
+                        )
+                    except Exception as e:
+                        result.add_error(f"Error processing file: {str(e)}")
+                        print(f"Error: {e}")
+                    result.processing_time += analysis_share + (time.time() - finish_start)
+
+        reader = threading.Thread(target=read_stage, name="file-reader", daemon=True)
+        writer = threading.Thread(target=write_stage, name="file-writer", daemon=True)
+        reader.start()
+        writer.start()
+
+        try:
+            # Analysis stage: runs here so the single analyzer stays hot
+            while True:
+                item = read_queue.get()
+                if item is None:
+                    break
+                group_index, group_results, prepared = item
+                results_by_group[group_index] = group_results
+
+                analysis_start = time.time()
+                try:
+                    if prepared and self.analyzer:
+                        texts = [entry[1] for entry in prepared]
+                        with self._maybe_disable_ner():
+                            matches_per_text = analyze_texts_for_pii(
+                                self.analyzer, texts, batch_size=batch_size,
+                                entities=self.enabled_entities
+                            )
+                        del texts
+                    else:
+                        matches_per_text = [[] for _ in prepared]
+                except Exception as e:
+                    # Analysis failed for the whole group: record it on
+                    # each file's result and keep consuming so the reader
+                    # never blocks forever on the bounded queue
+                    for result, _text, _output_path in prepared:
+                        result.add_error(f"Error processing file: {str(e)}")
+                    prepared = []
+                    matches_per_text = []
+                analysis_share = (time.time() - analysis_start) / len(prepared) if prepared else 0.0
+
+                write_queue.put((prepared, matches_per_text, analysis_share))
+                # Drop this stage's references so the group's texts are
+                # owned by the writer alone while we block on the next get
+                del item, prepared, matches_per_text
+        finally:
+            # Retire both helper threads even if the loop above bailed out
+            # early (e.g. KeyboardInterrupt): with a bounded queue and a
+            # stopped peer, a plain put/join here would wait forever
+            while writer.is_alive():
+                try:
+                    write_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            writer.join()
+            while reader.is_alive():
+                try:
+                    if read_queue.get(timeout=0.1) is None:
+                        break
+                except queue.Empty:
+                    continue
+            reader.join()
+
+        return [result for group in results_by_group if group for result in group]
+
+    @staticmethod
+    def _iter_txt_files(input_dir: str, recursive: bool):
+        """
+        Yield .txt file paths under a directory lazily.
+
+        Walks with os.scandir instead of Path.rglob so huge trees stream
+        into the processing loop instead of being listed up front - scandir
+        reuses the directory entry's type information, avoiding a stat per
+        file, and processing starts before the walk finishes.
+
+        Args:
+            input_dir: Directory to walk
+            recursive: Whether to descend into subdirectories
+
+        Yields:
+            Paths of .txt files (case-insensitive extension match)
+        """
+        stack = [input_dir]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file() and entry.name.lower().endswith('.txt'):
+                        yield entry.path
+
     def process_directory(
         self,
         input_dir: str,
         output_dir: Optional[str] = None,
-        recursive: bool = False
+        recursive: bool = False,
+        workers: int = 1
     ) -> List[ProcessResult]:
         """
         Process all files in a directory.
 
+        With workers > 1, files are distributed across a process pool;
+        each worker loads its own analyzer once (in the pool initializer)
+        and keeps it hot across files. Analysis is CPU-bound in spaCy, so
+        this scales with cores up to min(files, cores). With one worker,
+        files flow through the batched thread pipeline instead.
+
         Args:
             input_dir: Path to input directory
             output_dir: Path to output directory (auto-generated if None)
             recursive: Whether to process subdirectories recursively
+            workers: Number of worker processes (1 = in-process pipeline)
 
         Returns:
             List of ProcessResult objects, one per file
@@ -853,25 +1637,40 @@ class FileProcessor:
 
         results = []
 
-        # Get list of files
-        if recursive:
-            files = list(Path(input_dir).rglob('*.txt'))
+        # Walk lazily and pair each file with its mirrored output path;
+        # _write_file creates output subdirectories on demand
+        def _pairs():
+            for file_path in self._iter_txt_files(input_dir, recursive):
+                rel_path = os.path.relpath(file_path, input_dir)
+                yield file_path, os.path.join(output_dir, rel_path)
+
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import cpu_count
+
+            workers = min(workers, cpu_count())
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_file_worker,
+                initargs=(self.config,)
+            ) as executor:
+                # map preserves input order and consumes the walk lazily,
+                # so workers start before the directory scan finishes
+                results = list(executor.map(
+                    _process_file_worker, _pairs(), chunksize=4
+                ))
         else:
-            files = list(Path(input_dir).glob('*.txt'))
-
-        print(f"Found {len(files)} files to process")
-
-        for file_path in files:
-            # Calculate relative path for output
-            rel_path = file_path.relative_to(input_dir)
-            output_path = os.path.join(output_dir, str(rel_path))
-
-            # Create subdirectories if needed
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-            # Process file
-            result = self.process_file(str(file_path), output_path)
-            results.append(result)
+            # Route through the batched pipeline: reads and writes overlap
+            # analysis, and files are analyzed in nlp.pipe batches instead
+            # of one spaCy call each
+            input_paths = []
+            output_paths = []
+            for in_path, out_path in _pairs():
+                input_paths.append(in_path)
+                output_paths.append(out_path)
+
+            print(f"Found {len(input_paths)} files to process")
+            results = self.process_files(input_paths, output_paths)
 
         # Print summary
         successful = sum(1 for r in results if r.success)
@@ -879,6 +1678,54 @@ class FileProcessor:
 
         return results
 
+    def _detection_cache_get(self, namespace: bytes, text: str) -> Optional[List[PIIMatch]]:
+        """
+        Look up cached detection results for identical text content.
+
+        Args:
+            namespace: Single-byte tag separating detector domains
+                (b'p' = Presidio, b'l' = LLM) so the same text hashed by
+                different detectors can't collide
+            text: Text whose detection results are wanted
+
+        Returns:
+            Copy of the cached match list, or None on a miss
+        """
+        if not self._detection_cache_size:
+            return None
+        key = namespace + hashlib.blake2b(
+            text.encode(self.encoding), digest_size=16
+        ).digest()
+        matches = self._detection_cache.get(key)
+        if matches is None:
+            return None
+        self._detection_cache.move_to_end(key)
+        # Copy each match, not just the list: callers (the streaming
+        # offset shift) mutate matches in place, and handing out the
+        # cached objects would let those edits poison later hits
+        return [copy.copy(match) for match in matches]
+
+    def _detection_cache_put(self, namespace: bytes, text: str,
+                             matches: List[PIIMatch]) -> None:
+        """
+        Store detection results keyed by content hash, evicting LRU.
+
+        Args:
+            namespace: Single-byte detector-domain tag (see _detection_cache_get)
+            text: Text the matches were detected in
+            matches: Detection results to cache
+        """
+        if not self._detection_cache_size:
+            return
+        key = namespace + hashlib.blake2b(
+            text.encode(self.encoding), digest_size=16
+        ).digest()
+        # Store copies so later in-place edits to the caller's matches
+        # can't reach into the cache
+        self._detection_cache[key] = [copy.copy(match) for match in matches]
+        while len(self._detection_cache) > self._detection_cache_size:
+            self._detection_cache.popitem(last=False)
+
     def _detect_all_pii(self, text: str) -> List[PIIMatch]:
         """
         Detect PII using Presidio.
@@ -893,11 +1740,21 @@ class FileProcessor:
             print("  Warning: Presidio not initialized")
             return []
 
+        cached = self._detection_cache_get(b'p', text)
+        if cached is not None:
+            print(f"  Presidio: reusing cached results for duplicate content "
+                  f"({len(cached)} PII instances)")
+            return cached
+
         try:
             # Use shared analysis function (handles normalization and false positive filtering)
-            matches = analyze_text_for_pii(self.analyzer, text)
+            with self._maybe_disable_ner():
+                matches = analyze_text_for_pii(
+                    self.analyzer, text, entities=self.enabled_entities
+                )
 
             print(f"  Presidio: found {len(matches)} PII instances")
+            self._detection_cache_put(b'p', text, matches)
             return matches
 
         except Exception as e:
@@ -916,9 +1773,14 @@ class FileProcessor:
         """
         from src.processors.pii_detection import apply_llm_second_pass
 
-        llm_config = self.config.get('llm_detection', {})
-        results = apply_llm_second_pass([text], llm_config)
-        return results[0] if results else []
+        cached = self._detection_cache_get(b'l', text)
+        if cached is not None:
+            return cached
+
+        results = apply_llm_second_pass([text], self.llm_config)
+        matches = results[0] if results else []
+        self._detection_cache_put(b'l', text, matches)
+        return matches
 
     def _get_context(self, text: str, start: int, end: int, context_chars: int = 20) -> str:
         """
@@ -950,35 +1812,58 @@ class FileProcessor:
         Returns:
             Filtered list of matches
         """
-        whitelist = self.config.get('whitelist', {})
-        blacklist = self.config.get('blacklist', [])
+        whitelist = self.whitelist
+        blacklist = self.blacklist
 
-        filtered = []
+        # Nothing configured: every match is kept unchanged
+        if not blacklist and not any(whitelist.values()):
+            return matches
 
+        # A match is dropped only when whitelisted and not blacklisted
+        # (blacklist overrides whitelist). Testing the whitelist first
+        # means the common non-whitelisted match costs one check, and the
+        # blacklist is only consulted for the rare whitelisted value.
+        filtered = []
         for match in matches:
-            # Check blacklist (always anonymize)
-            if is_blacklisted(match.value, blacklist):
-                filtered.append(match)
+            if is_whitelisted(match.value, whitelist) and \
+                    not is_blacklisted(match.value, blacklist):
                 continue
-
-            # Check whitelist (never anonymize)
-            if is_whitelisted(match.value, whitelist):
-                continue
-
             filtered.append(match)
 
         return filtered
 
+    # Files at least this large are read via mmap instead of f.read()
+    _MMAP_READ_THRESHOLD = 1024 * 1024
+
     def _read_file(self, path: str) -> str:
         """
         Read file content.
 
+        Large files are memory-mapped and decoded straight from the mapping,
+        so the raw bytes stay file-backed (the OS can page them in and drop
+        them under pressure) instead of being duplicated on the Python heap
+        alongside the decoded string.
+
         Args:
             path: File path
 
         Returns:
             File content as string
         """
+        if os.path.getsize(path) >= self._MMAP_READ_THRESHOLD:
+            import mmap
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    # str() decodes via the buffer protocol - no bytes copy
+                    text = str(memoryview(buf), self.encoding)
+            # Match the text-mode branch's universal newlines so output
+            # bytes don't depend on which side of the size threshold a
+            # file lands; each replace is one C-level pass and the guard
+            # skips both for the common LF-only file
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
+
         with open(path, 'r', encoding=self.encoding) as f:
             return f.read()
 
@@ -995,8 +1880,73 @@ class FileProcessor:
         if directory:  # Only create if directory path is not empty
             os.makedirs(directory, exist_ok=True)
 
+        if self.direct_io:
+            self._write_file_uncached(path, content)
+            return
+
+        # Encode once and write through the raw fd - skips TextIOWrapper's
+        # incremental encoder and buffer copies on large outputs
+        data = content.encode(self.encoding)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def _write_file_parts(self, path: str, parts) -> None:
+        """
+        Write an iterable of string pieces to file without joining them.
+
+        Args:
+            path: File path
+            parts: Iterable of string pieces to write in order
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.direct_io:
+            self._write_file_uncached(path, ''.join(parts))
+            return
+
         with open(path, 'w', encoding=self.encoding) as f:
-            f.write(content)
+            f.writelines(parts)
+
+    def _write_file_uncached(self, path: str, content: str) -> None:
+        """
+        Write a file without leaving its pages in the OS page cache.
+
+        Bulk jobs write many anonymized copies that are never read back;
+        letting them fill the page cache evicts hotter data and defers a
+        burst of dirty writeback. This path pre-sizes the file with
+        posix_fallocate (one contiguous extent instead of growth-driven
+        fragmentation), syncs the data, then tells the kernel to drop the
+        cached pages. Enabled with processing.direct_io; each step degrades
+        to a plain write on platforms or filesystems that lack it.
+
+        Args:
+            path: File path
+            content: Content to write
+        """
+        data = content.encode(self.encoding)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if data and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, len(data))
+                except OSError:
+                    pass  # filesystem doesn't support fallocate
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if hasattr(os, 'fdatasync') and hasattr(os, 'posix_fadvise'):
+                # DONTNEED only evicts clean pages, so flush first
+                os.fdatasync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
 
     def _generate_output_path(self, input_path: str) -> str:
         """
@@ -1008,8 +1958,10 @@ class FileProcessor:
         Returns:
             Output file path
         """
-        path = Path(input_path)
-        return str(path.parent / f"{path.stem}{self.output_suffix}{path.suffix}")
+        # Plain string split/concat: called once per file in directory
+        # runs, and Path object construction costs more than the work
+        root, ext = os.path.splitext(input_path)
+        return f"{root}{self.output_suffix}{ext}"
 
     def _generate_audit_path(self, output_path: str) -> str:
         """
@@ -1021,19 +1973,32 @@ class FileProcessor:
         Returns:
             Audit log file path
         """
-        path = Path(output_path)
-        return str(path.parent / f"{path.stem}_audit.json")
+        root, _ = os.path.splitext(output_path)
+        return f"{root}_audit.json"
 
     def _backup_file(self, path: str) -> None:
         """
         Create backup of file.
 
+        The backup is a hardlink when the filesystem allows it: processing
+        never modifies the original in place (output goes to a separate
+        path), so a link is a valid zero-copy backup - instantaneous and no
+        duplicate disk usage regardless of file size. Filesystems without
+        hardlink support fall back to copyfile, which transfers in-kernel
+        (sendfile on Linux) and skips copy2's metadata syscalls - the
+        backup's own timestamps don't matter, its bytes do.
+
         Args:
             path: File path to backup
         """
-        import shutil
         backup_path = f"{path}.backup"
-        shutil.copy2(path, backup_path)
+        try:
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            os.link(path, backup_path)
+        except OSError:
+            import shutil
+            shutil.copyfile(path, backup_path)
         print(f"Backup created: {backup_path}")
 
     def _write_audit_log(self, path: str, matches: List[PIIMatch]) -> None:
@@ -1045,23 +2010,35 @@ class FileProcessor:
             matches: List of PIIMatch objects
         """
         timestamp = get_timestamp()
+        strategy = self.anonymizer.get_strategy_name()
 
-        entries = []
-        for match in matches:
-            entry = AuditLogEntry(
-                pii_type=match.pii_type,
-                position=match.start,
-                anonymization_strategy=self.anonymizer.get_strategy_name(),
-                timestamp=timestamp
-            )
-            entries.append(entry.to_dict())
-
-        audit_data = {
+        # NDJSON: a header record followed by one entry per line. Entries
+        # stream straight to the file instead of accumulating in a list
+        # first, so peak memory and serializer cost stay flat no matter
+        # how many matches a file produced.
+        header = {
             "timestamp": timestamp,
-            "strategy": self.anonymizer.get_strategy_name(),
+            "strategy": strategy,
             "total_anonymized": len(matches),
-            "entries": entries
         }
 
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(audit_data, f, indent=2)
+            f.write(json.dumps(header, separators=(',', ':')))
+            f.write('\n')
+
+            # Every entry shares the strategy/timestamp/hash fields; only
+            # pii_type and position vary per match. Rendering the shared
+            # tail once and one prefix per distinct type replaces the
+            # AuditLogEntry + to_dict + json.dumps round-trip per match
+            # with a string concatenation.
+            tail = ',"strategy":%s,"timestamp":%s,"hash":null}\n' % (
+                json.dumps(strategy), json.dumps(timestamp)
+            )
+            prefix_by_type: Dict[str, str] = {}
+            write = f.write
+            for match in matches:
+                prefix = prefix_by_type.get(match.pii_type)
+                if prefix is None:
+                    prefix = '{"pii_type":%s,"position":' % json.dumps(match.pii_type)
+                    prefix_by_type[match.pii_type] = prefix
+                write(prefix + str(match.start) + tail)
@@ -12,14 +12,110 @@ if TYPE_CHECKING:
     from presidio_analyzer import AnalyzerEngine
 
 from src.models import PIIMatch
-from src.utils import get_context
 from src.config.config_manager import ConfigManager
 
 
 # Load false positive words from config at module level
 _config = ConfigManager.load()
 _fp_words_list = _config.config_data.get('false_positive_words', [])
-FALSE_POSITIVE_WORDS: frozenset[str] = frozenset(w.lower() for w in _fp_words_list)
+# casefold rather than lower so config words match their full
+# case-insensitive Unicode variants (identical for the ASCII defaults)
+FALSE_POSITIVE_WORDS: frozenset[str] = frozenset(w.casefold() for w in _fp_words_list)
+
+# Entity types to skip (spaCy NER detects these but they're too noisy)
+# DATE_TIME catches all dates - we only want DOB with context
+SKIP_ENTITIES: frozenset[str] = frozenset(
+    {'DATE_TIME', 'CARDINAL', 'ORDINAL', 'QUANTITY', 'MONEY'}
+)
+
+# Titles that indicate a following word is likely a person name
+TITLE_PREFIXES: frozenset[str] = frozenset(
+    {'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'rev', 'sir', 'dame', 'lord', 'lady'}
+)
+
+# Entity types that must always be requested from the analyzer when a
+# config filter is in effect: filter_results_to_matches reclassifies
+# name-like ORGANIZATION/LOCATION hits as PERSON and false-positive
+# filters NRP, so those results have to reach it even when the config
+# doesn't enable them directly. Types the config didn't enable are
+# dropped again after reclassification.
+RECLASSIFY_SOURCE_ENTITIES: frozenset[str] = frozenset({'ORGANIZATION', 'LOCATION', 'NRP'})
+
+
+# Worker-local freelist of PIIMatch instances. Dense-PII CSVs construct and
+# drop thousands of matches per second; recycling instances amortizes the
+# allocation churn. Callers that fully consume their matches (the CSV row
+# loops) hand them back via release_pii_matches; callers that retain matches
+# (file processing keeps them on the result) simply never release.
+_PII_MATCH_POOL: list[PIIMatch] = []
+_PII_MATCH_POOL_MAX = 1024
+
+
+def _make_pii_match(
+    pii_type: str,
+    value: str,
+    start: int,
+    end: int,
+    confidence: float,
+    detector_name: str,
+    context: str = '',
+) -> PIIMatch:
+    """Construct a PIIMatch, reusing a pooled instance when one is free."""
+    if _PII_MATCH_POOL:
+        match = _PII_MATCH_POOL.pop()
+        match.pii_type = pii_type
+        match.value = value
+        match.start = start
+        match.end = end
+        match.confidence = confidence
+        match.context = context
+        match.detector_name = detector_name
+        return match
+    return PIIMatch(
+        pii_type=pii_type,
+        value=value,
+        start=start,
+        end=end,
+        confidence=confidence,
+        context=context,
+        detector_name=detector_name,
+    )
+
+
+def release_pii_matches(matches: list[PIIMatch]) -> None:
+    """
+    Return fully-consumed matches to the pool.
+
+    Only call this once nothing else references the matches - pooled
+    instances are mutated in place on reuse.
+
+    Args:
+        matches: Matches that are no longer referenced anywhere
+    """
+    pool = _PII_MATCH_POOL
+    for match in matches:
+        if len(pool) >= _PII_MATCH_POOL_MAX:
+            break
+        pool.append(match)
+
+
+# Only match title + 1-3 ALL CAPS name words
+# Requires: MR/MS/DR/etc prefix to avoid false positives on technical terms
+# Each name word: 2+ letters OR apostrophe pattern (O'BRIEN) OR hyphenated (SMITH-JONES)
+# Name component: capitals with optional apostrophe/hyphen followed by more capitals
+_NAME_PART = r"(?:[A-Z]+'[A-Z]+|[A-Z]{2,}(?:-[A-Z]+)*)"
+_CAPS_NAME_RE = re.compile(
+    rf"\b(?:MR|MRS|MS|MISS|DR|PROF|REV|SIR|DAME|LORD|LADY)\s+{_NAME_PART}(?:\s+{_NAME_PART}){{0,2}}\b"
+)
+
+# Prescreen: one pass that matches iff the text contains an uppercase
+# title followed by whitespace - a strict superset of what _CAPS_NAME_RE
+# can match, so a miss here safely skips the full scan. Measured faster
+# than looping per-title substring checks on both short cell values and
+# megabyte logs.
+_TITLE_PRESCREEN_RE = re.compile(
+    r'(?:MR|MRS|MS|MISS|DR|PROF|REV|SIR|DAME|LORD|LADY)\s'
+)
 
 
 def normalize_caps_for_ner(text: str) -> str:
@@ -37,59 +133,211 @@ def normalize_caps_for_ner(text: str) -> str:
 
     Since character count is preserved, entity positions map back exactly.
     """
-    def title_case_match(match):
-        return match.group(0).title()
+    if _TITLE_PRESCREEN_RE.search(text) is None:
+        return text
+
+    return _CAPS_NAME_RE.sub(lambda m: m.group(0).title(), text)
+
+
+# Texts longer than this are split before hitting spaCy. Keeps peak memory
+# proportional to the chunk, not the file (spaCy Docs are heavy - roughly
+# 1GB per 100k chars with full pipelines), and stays under spaCy's default
+# max_length so no limit bump is needed.
+_MAX_ANALYSIS_CHARS = 400_000
+
+
+def _chunk_text(text: str, max_chars: int = _MAX_ANALYSIS_CHARS) -> list[tuple[int, str]]:
+    """
+    Split text into chunks of at most max_chars at natural boundaries.
 
-    # Only match title + 1-3 ALL CAPS name words
-    # Requires: MR/MS/DR/etc prefix to avoid false positives on technical terms
-    # Each name word: 2+ letters OR apostrophe pattern (O'BRIEN) OR hyphenated (SMITH-JONES)
-    # Name component: capitals with optional apostrophe/hyphen followed by more capitals
-    name_part = r"(?:[A-Z]+'[A-Z]+|[A-Z]{2,}(?:-[A-Z]+)*)"
-    pattern = rf"\b(?:MR|MRS|MS|MISS|DR|PROF|REV|SIR|DAME|LORD|LADY)\s+{name_part}(?:\s+{name_part}){{0,2}}\b"
+    Prefers paragraph breaks, then sentence ends, then newlines, so PII
+    spans are very unlikely to straddle a cut; falls back to a hard cut
+    only for max_chars of unbroken text.
 
-    return re.sub(pattern, title_case_match, text)
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        List of (offset, chunk) tuples covering the whole text
+    """
+    if len(text) <= max_chars:
+        return [(0, text)]
+
+    chunks = []
+    pos = 0
+    length = len(text)
+    while pos < length:
+        end = pos + max_chars
+        if end >= length:
+            chunks.append((pos, text[pos:]))
+            break
+        # Look for a boundary in the second half of the window so chunks
+        # stay reasonably sized
+        floor = pos + max_chars // 2
+        cut = text.rfind('\n\n', floor, end)
+        if cut == -1:
+            cut = text.rfind('. ', floor, end)
+        if cut == -1:
+            cut = text.rfind('\n', floor, end)
+        if cut == -1:
+            cut = end
+        else:
+            cut += 1  # Keep the boundary character with the earlier chunk
+        chunks.append((pos, text[pos:cut]))
+        pos = cut
+    return chunks
 
 
 def analyze_text_for_pii(
     analyzer: "AnalyzerEngine",
     text: str,
     language: str = 'en',
+    entities: "list[str] | None" = None,
 ) -> list[PIIMatch]:
     """
     Analyze text for PII using Presidio analyzer with normalization and false positive filtering.
 
     This is the shared detection function used by both file and CSV processors.
     False positive words are loaded from config at module import time.
+    Oversized texts are analyzed in chunks (see _chunk_text) with match
+    offsets shifted back to full-text positions.
 
     Args:
         analyzer: Presidio AnalyzerEngine instance
         text: Text to analyze
         language: Language code (default: 'en')
+        entities: Entity types to keep (None = all). Reclassification
+            source types are always analyzed; non-enabled types are
+            dropped after reclassification.
 
     Returns:
         List of PIIMatch objects
     """
-    # Normalize ALL CAPS sequences for better NER detection
-    # "MR BERNARD HYNES" -> "Mr Bernard Hynes" (same length, positions map 1:1)
-    normalized_text = normalize_caps_for_ner(text)
-
-    # Analyze with Presidio on normalized text
-    # Use score_threshold to filter out low-confidence matches (e.g., bare dates without context)
-    results = analyzer.analyze(
-        text=normalized_text,
+    # Empty or whitespace/punctuation-only text can't contain PII of any
+    # kind - skip the spaCy pass outright
+    if not text or not any(c.isalnum() for c in text):
+        return []
+
+    # Widen the analyzer request so reclassification sources are seen,
+    # and filter back down to the configured types afterwards
+    if entities is not None:
+        requested = list(set(entities) | RECLASSIFY_SOURCE_ENTITIES)
+        allowed = frozenset(entities)
+    else:
+        requested = None
+        allowed = None
+
+    matches = []
+    for offset, chunk in _chunk_text(text):
+        # Normalize ALL CAPS sequences for better NER detection
+        # "MR BERNARD HYNES" -> "Mr Bernard Hynes" (same length, positions map 1:1)
+        normalized_text = normalize_caps_for_ner(chunk)
+
+        # Analyze with Presidio on normalized text
+        # Use score_threshold to filter out low-confidence matches (e.g., bare dates without context)
+        results = analyzer.analyze(
+            text=normalized_text,
+            language=language,
+            entities=requested,
+            score_threshold=0.5
+        )
+
+        chunk_matches = filter_results_to_matches(results, chunk)
+        if allowed is not None:
+            chunk_matches = [m for m in chunk_matches if m.pii_type in allowed]
+        if offset:
+            for match in chunk_matches:
+                match.start += offset
+                match.end += offset
+        matches.extend(chunk_matches)
+
+    return matches
+
+
+def analyze_texts_for_pii(
+    analyzer: "AnalyzerEngine",
+    texts: list[str],
+    language: str = 'en',
+    batch_size: int = 16,
+    entities: "list[str] | None" = None,
+) -> list[list[PIIMatch]]:
+    """
+    Analyze a batch of texts for PII in one Presidio pass.
+
+    Routes all texts through BatchAnalyzerEngine so spaCy's nlp.pipe can
+    amortize pipeline overhead across documents instead of paying it per
+    call. Applies the same normalization and false positive filtering as
+    analyze_text_for_pii.
+
+    Args:
+        analyzer: Presidio AnalyzerEngine instance
+        texts: Texts to analyze
+        language: Language code (default: 'en')
+        batch_size: Documents per nlp.pipe batch
+        entities: Entity types to keep (None = all, see analyze_text_for_pii)
+
+    Returns:
+        List of PIIMatch lists, one per input text
+    """
+    from presidio_analyzer import BatchAnalyzerEngine
+
+    # Same entity widening/refiltering as analyze_text_for_pii
+    if entities is not None:
+        requested = list(set(entities) | RECLASSIFY_SOURCE_ENTITIES)
+        allowed = frozenset(entities)
+    else:
+        requested = None
+        allowed = None
+
+    # Flatten oversized texts into offset-tagged chunks so one iterator
+    # feeds nlp.pipe regardless of individual document size
+    chunked = [
+        (text_idx, offset, chunk)
+        for text_idx, text in enumerate(texts)
+        for offset, chunk in _chunk_text(text)
+    ]
+    normalized = [normalize_caps_for_ner(chunk) for _, _, chunk in chunked]
+
+    batch_engine = BatchAnalyzerEngine(analyzer_engine=analyzer)
+    all_results = batch_engine.analyze_iterator(
+        texts=normalized,
         language=language,
-        score_threshold=0.5
+        batch_size=batch_size,
+        entities=requested,
+        score_threshold=0.5,
     )
 
-    if not results:
-        return []
+    per_text: list[list[PIIMatch]] = [[] for _ in texts]
+    for (text_idx, offset, chunk), results in zip(chunked, all_results):
+        chunk_matches = filter_results_to_matches(results, chunk)
+        if allowed is not None:
+            chunk_matches = [m for m in chunk_matches if m.pii_type in allowed]
+        if offset:
+            for match in chunk_matches:
+                match.start += offset
+                match.end += offset
+        per_text[text_idx].extend(chunk_matches)
 
-    # Entity types to skip (spaCy NER detects these but they're too noisy)
-    # DATE_TIME catches all dates - we only want DOB with context
-    SKIP_ENTITIES = {'DATE_TIME', 'CARDINAL', 'ORDINAL', 'QUANTITY', 'MONEY'}
+    return per_text
 
-    # Titles that indicate a following word is likely a person name
-    TITLE_PREFIXES = {'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'rev', 'sir', 'dame', 'lord', 'lady'}
+
+def filter_results_to_matches(results: list, text: str) -> list[PIIMatch]:
+    """
+    Convert Presidio RecognizerResults to PIIMatch objects with filtering.
+
+    Skips noisy entity types, drops known false positives, and reclassifies
+    name-like ORGANIZATION/LOCATION hits as PERSON.
+
+    Args:
+        results: RecognizerResult list from the analyzer
+        text: The original (un-normalized) text the results refer to
+
+    Returns:
+        List of PIIMatch objects
+    """
+    if not results:
+        return []
 
     # Convert to PIIMatch objects, filtering out known false positives
     matches = []
@@ -99,29 +347,28 @@ def analyze_text_for_pii(
             continue
 
         matched_value = text[result.start:result.end]
-        matched_lower = matched_value.lower()
 
         # Skip known false positives for PERSON/ORG/LOCATION/NRP entities
         if result.entity_type in ('PERSON', 'ORGANIZATION', 'LOCATION', 'NRP'):
-            matched_words = matched_lower.split()
             # For PERSON: only skip if the FIRST word is a false positive
             # This allows "felicity cac" (name + abbreviation) to pass through
             # For ORG/LOCATION: skip if ANY word is a false positive
             if result.entity_type == 'PERSON':
-                if matched_words and matched_words[0] in FALSE_POSITIVE_WORDS:
+                # Split only up to the first word - the rest is never
+                # inspected for PERSON hits
+                first_word = matched_value.casefold().split(None, 1)[:1]
+                if first_word and first_word[0] in FALSE_POSITIVE_WORDS:
                     continue
             else:
-                if any(word in FALSE_POSITIVE_WORDS for word in matched_words):
+                matched_words = matched_value.casefold().split()
+                # isdisjoint runs the membership loop in C instead of
+                # one interpreter iteration per word
+                if not FALSE_POSITIVE_WORDS.isdisjoint(matched_words):
                     continue
 
         # Reclassify ORGANIZATION/LOCATION as PERSON when it looks like a name
         # spaCy often misclassifies names in business context (e.g., "Bernard" as ORG)
         if result.entity_type in ('ORGANIZATION', 'LOCATION'):
-            # Check if preceded by a title - definitely a PERSON
-            prefix_start = max(0, result.start - 10)
-            prefix_text = text[prefix_start:result.start].lower().split()
-            preceded_by_title = prefix_text and prefix_text[-1].rstrip('.') in TITLE_PREFIXES
-
             # Single capitalized word that looks like a name (not all caps tech term)
             is_single_name = (
                 len(matched_words) == 1 and
@@ -130,26 +377,36 @@ def analyze_text_for_pii(
                 len(matched_value) > 2  # Not short abbreviation
             )
 
+            # Check if preceded by a title - definitely a PERSON.
+            # Only inspected when the cheaper single-name test fails,
+            # skipping the prefix lower/split on the common path.
+            if not is_single_name:
+                prefix_start = max(0, result.start - 10)
+                prefix_text = text[prefix_start:result.start].lower().split()
+                preceded_by_title = (
+                    bool(prefix_text) and prefix_text[-1].rstrip('.') in TITLE_PREFIXES
+                )
+            else:
+                preceded_by_title = False
+
             if preceded_by_title or is_single_name:
                 # Reclassify as PERSON
-                matches.append(PIIMatch(
+                matches.append(_make_pii_match(
                     pii_type='PERSON',
                     value=matched_value,
                     start=result.start,
                     end=result.end,
                     confidence=result.score,
-                    context=get_context(text, result.start, result.end),
                     detector_name="Presidio"
                 ))
                 continue
 
-        matches.append(PIIMatch(
+        matches.append(_make_pii_match(
             pii_type=result.entity_type,
             value=matched_value,
             start=result.start,
             end=result.end,
             confidence=result.score,
-            context=get_context(text, result.start, result.end),
             detector_name="Presidio"
         ))
 
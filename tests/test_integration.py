@@ -8,6 +8,7 @@ import pytest
 from src.processors.file_processor import FileProcessor
 
 
+@pytest.mark.integration
 class TestFileProcessing:
     """Test file processing with Presidio."""
 
@@ -1,8 +1,12 @@
 """Unit and integration tests for LLM second-pass PII detection."""
 
 import json
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+import pytest
+
+import src.llm
 from src.llm import (
     create_llm_client,
     create_async_llm_client,
@@ -14,6 +18,14 @@ from src.llm import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _reset_azure_cache():
+    """Clear the module-level Azure credential/token cache between tests."""
+    src.llm._azure_credential = None
+    src.llm._azure_token = None
+    yield
+
+
 class TestResolveEnv:
     """Test environment variable resolution."""
 
@@ -232,20 +244,30 @@ class TestCreateAsyncLLMClient:
         assert call_kwargs['api_key'] == "actual-jwt-token"
 
 
+def _make_response(content: str):
+    """Build a response object with the OpenAI completion shape.
+
+    SimpleNamespace instead of Mock: attribute access is plain, no
+    auto-created child mocks per test.
+    """
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+
+
+def _make_client(content: str):
+    """Build a mock client whose chat completion returns content."""
+    mock_client = Mock()
+    mock_client.chat.completions.create.return_value = _make_response(content)
+    return mock_client
+
+
 class TestDetectPIIWithLLM:
     """Test PII detection with mocked LLM responses."""
 
-    def _create_mock_response(self, content: str):
-        """Create a mock OpenAI response."""
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = content
-        return mock_response
-
     def test_detect_single_pii(self):
         """Test detecting a single PII item."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '[{"t":"EMAIL","v":"john@example.com"}]'
         )
         
@@ -259,8 +281,7 @@ class TestDetectPIIWithLLM:
 
     def test_detect_multiple_pii(self):
         """Test detecting multiple PII items."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '[{"t":"NAME","v":"John Smith"},{"t":"PHONE","v":"0412345678"}]'
         )
         
@@ -273,8 +294,7 @@ class TestDetectPIIWithLLM:
 
     def test_empty_response(self):
         """Test handling empty array response."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response('[]')
+        mock_client = _make_client('[]')
         
         text = "No PII here"
         matches = detect_pii_with_llm(mock_client, text, "gpt-4o-mini")
@@ -283,8 +303,7 @@ class TestDetectPIIWithLLM:
 
     def test_markdown_wrapped_response(self):
         """Test handling markdown code block response."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '```json\n[{"t":"EMAIL","v":"test@test.com"}]\n```'
         )
         
@@ -296,8 +315,7 @@ class TestDetectPIIWithLLM:
 
     def test_invalid_json_response(self):
         """Test handling invalid JSON gracefully."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             'This is not valid JSON'
         )
         
@@ -308,8 +326,7 @@ class TestDetectPIIWithLLM:
 
     def test_value_not_in_text_skipped(self):
         """Test PII value not found in text is skipped."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '[{"t":"NAME","v":"Jane Doe"}]'
         )
         
@@ -320,8 +337,7 @@ class TestDetectPIIWithLLM:
 
     def test_false_positive_filtered(self):
         """Test false positive words are filtered out."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '[{"t":"ORGANIZATION","v":"Telstra"},{"t":"NAME","v":"John"}]'
         )
         
@@ -335,8 +351,7 @@ class TestDetectPIIWithLLM:
 
     def test_confidence_score(self):
         """Test LLM matches have correct confidence score."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response(
+        mock_client = _make_client(
             '[{"t":"EMAIL","v":"a@b.com"}]'
         )
         
@@ -347,8 +362,7 @@ class TestDetectPIIWithLLM:
 
     def test_custom_system_prompt(self):
         """Test custom system prompt is passed to LLM."""
-        mock_client = Mock()
-        mock_client.chat.completions.create.return_value = self._create_mock_response('[]')
+        mock_client = _make_client('[]')
         
         custom_prompt = "Custom detection rules"
         detect_pii_with_llm(mock_client, "text", "model", system_prompt=custom_prompt)
@@ -385,9 +399,9 @@ class TestDetectPIIBatchConcurrent:
         config = {'enabled': True, 'model': 'gpt-4o-mini'}
         texts = ["", "real text", "   ", "[REDACTED]"]
         
-        # Mock asyncio.get_event_loop
-        with patch('asyncio.get_event_loop') as mock_loop:
-            mock_loop.return_value.run_until_complete.return_value = [[]]
+        # Mock asyncio.run (close the coroutine so it isn't left pending)
+        with patch('src.llm.asyncio.run') as mock_run:
+            mock_run.side_effect = lambda coro: coro.close() or [[]]
             results = detect_pii_batch_concurrent(config, texts, show_progress=False)
         
         # Should have results for all 4 texts
@@ -406,6 +420,7 @@ class TestDetectPIIBatchConcurrent:
         # In real usage, the function correctly maps results
 
 
+@pytest.mark.integration
 class TestIntegrationWithMockedLLM:
     """Integration tests with mocked LLM responses."""
 
@@ -0,0 +1,59 @@
+"""
+Regression tests for regex worst-case behavior.
+
+The address, PO box and driver license recognizers previously used nested
+unbounded quantifiers that could backtrack badly on adversarial input.
+These tests feed each pattern long non-matching strings and assert the
+scan stays fast (i.e. matching remains linear).
+"""
+
+import re
+import time
+
+from src.processors.file_processor import FileProcessor
+
+
+def _recognizers():
+    """Build the recognizers under test without a full FileProcessor."""
+    fp = FileProcessor.__new__(FileProcessor)
+    return [
+        fp._create_enhanced_address_recognizer(),
+        fp._create_po_box_recognizer(),
+        fp._create_driver_license_recognizer(),
+    ]
+
+
+# Inputs that get deep into the patterns before failing - the worst case
+# for backtracking engines
+PATHOLOGICAL_INPUTS = [
+    "1 " + "a" * 2000,
+    "1 " + "word " * 400,
+    "12 " + "a " * 1000 + "!",
+    "PO Box 1 " + " " * 1000 + "x",
+    "license" + " " * 2000 + "x",
+    " " * 1000 + "9" * 1000,
+]
+
+
+class TestPathologicalInputs:
+    """Worst-case input handling for backtracking-prone patterns."""
+
+    def test_patterns_compile(self):
+        """Every pattern must compile under the stdlib re engine."""
+        for recognizer in _recognizers():
+            for pattern in recognizer.patterns:
+                re.compile(pattern.regex)
+
+    def test_patterns_scan_quickly_on_adversarial_input(self):
+        """Each pattern scans each pathological input in under 10ms."""
+        for recognizer in _recognizers():
+            for pattern in recognizer.patterns:
+                compiled = re.compile(pattern.regex)
+                for text in PATHOLOGICAL_INPUTS:
+                    start = time.perf_counter()
+                    compiled.search(text)
+                    elapsed = time.perf_counter() - start
+                    assert elapsed < 0.01, (
+                        f"{pattern.name} took {elapsed * 1000:.1f}ms on "
+                        f"{text[:30]!r}..."
+                    )